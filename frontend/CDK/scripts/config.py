@@ -19,6 +19,29 @@ TOOLTIP_TEXT_MAX_LENGTH = 600
 TOOLTIP_TEXT_WIDTH = 100
 TOOLTIP_MAX_PROPERTIES = 3
 TOOLTIP_MAX_PROPERTIES = 3
+# Key of the edges between classes and their superclasses
+SUBCLASS_OF = 'http://www.w3.org/2000/01/rdf-schema#subClassOf'
+# Key of the edges to the aggregated datatype properties of a class
+DATATYPE_PROPERTY = 'http://www.w3.org/2002/07/owl#DatatypeProperty'
+# Nodes standing for collapsed subclasses
+CLUSTER_NODE_SHAPE = 'database'
+CLUSTER_NODE_COLOR = '#DDD'
+CLUSTER_MAX_LISTED = 10
+# Precomputed layouts of graphs, in pixels
+LAYOUT_NODE_SPACING = 150
+LAYOUT_LEVEL_SEPARATION = 200
+LAYOUT_SCALE = 1000
+LAYOUT_SEED = 0
+# Layouts computed before rendering. The networkx ones other than circular
+# and shell need scipy.
+LAYOUTS = ['hierarchical', 'radial', 'circular', 'shell', 'spring',
+           'kamada_kawai']
+# Graph of the whole ontology, drawn far smaller than the graphs of a few
+# classes
+ONTOLOGY_GRAPH_TITLE = 'Figure: Class hierarchy of the ontology'
+ONTOLOGY_NODE_SIZE = 10
+# Memoized tooltips of graph nodes
+TOOLTIP_CACHE_SIZE = 4096
 # LEGEND_URL = ('https://image-assets-for-cdk.s3.eu-central-1.amazonaws.com/'
 # 'legend_for_cell.png')
 
@@ -60,6 +83,104 @@ INDIVIDUAL_NAMESPACE = '/enapso-dev/individual-management'
 TEMPLATE_NAMESPACE = '/enapso-dev/view-management'
 
 REQUEST_TIMEOUT = 300
+# Seconds before expiry at which a cached access token is renewed
+TOKEN_EXPIRY_MARGIN = 30
+
+# Config vars for the HTTP transport
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 10
+MAX_RETRIES = 3
+RETRY_BACKOFF_FACTOR = 0.5
+RETRY_BACKOFF_MAX = 8
+RETRY_STATUSES = [429, 500, 502, 503, 504]
+# Concurrent requests used to acquire properties of several classes
+PROPERTIES_WORKERS = 8
+# Concurrent requests of an AsyncOntologyClient, clamped to the pool size
+ASYNC_CONCURRENCY = 8
+# Cached properties of classes, in entries and seconds
+PROPERTIES_CACHE_SIZE = 1024
+PROPERTIES_CACHE_TTL = 10 * 60
+# Memoized IRIs for names and prefixes
+IRI_CACHE_SIZE = 16 * 1024
+# Bytes read at a time from streamed responses
+STREAM_CHUNK_SIZE = 64 * 1024
+# Characters of a streamed class tree tried to be decoded at once
+STREAM_WINDOW_SIZE = 4 * 1024
+# Read-only endpoints which are safe to send again
+RETRY_ENDPOINTS = [
+    'get-all-classes',
+    'get-class-own-properties',
+    'read-individual',
+    'execute-template'
+]
+
+ANNOTATION_TEMPLATE = ('http://www.ebu.ch/metadata/ontologies/ebucoreplus#'
+'SPARQLTemplate_e5e398b0-f9de-417a-b5c1-39f793f30f9d')
+
+INDIVIDUAL_TEMPLATE = ('http://ont.telekom.de/cia/sparql-template#'
+'SPARQLTemplate_2c08776d-ee35-4ac5-9d22-b4835d394e56')
+
+# Config vars for model snapshots
+SNAPSHOT_DIR = os.getenv('SNAPSHOT_DIR', os.path.join(
+    os.path.expanduser('~'), '.cache', 'cdk', 'snapshots'))
+SNAPSHOT_TTL = 24 * 60 * 60
+# Bump when the layout of the model DataFrame changes
+SNAPSHOT_VERSION = 2
+
+# Config vars for exported graphs
+GRAPHS_DIR = os.getenv('GRAPHS_DIR', os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'graphs'))
+# Directory next to the exported pages, holding the assets they share
+GRAPH_ASSETS_DIR = 'static'
+# Extensions of the files written per export format
+GRAPH_EXPORT_FORMATS = {
+    'json': 'json',
+    'graphml': 'graphml',
+    'html': 'html',
+    'graphology': 'graphology.json'
+}
+VIS_STYLE_URL = 'https://cdnjs.cloudflare.com/ajax/libs/vis/4.16.1/vis.css'
+VIS_SCRIPT_URL = ('https://cdnjs.cloudflare.com/ajax/libs/vis/4.16.1/'
+'vis-network.min.js')
+GRAPH_STYLE = """body {
+    font-family: sans-serif;
+}
+
+#graph {
+    border: 1px solid lightgray;
+    position: relative;
+}
+"""
+GRAPH_SCRIPT = """(function () {
+    var data = JSON.parse(document.getElementById('graph-data').textContent);
+    var container = document.getElementById('graph');
+
+    container.style.height = data.height;
+    container.style.width = data.width;
+
+    new vis.Network(container, {
+        nodes: new vis.DataSet(data.nodes),
+        edges: new vis.DataSet(data.edges)
+    }, data.options);
+})();
+"""
+GRAPH_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<link rel="stylesheet" href="{vis_style}">
+<link rel="stylesheet" href="{assets}/graph.css">
+<script src="{vis_script}"></script>
+</head>
+<body>
+<h1>{title}</h1>
+<div id="graph"></div>
+<script id="graph-data" type="application/json">{data}</script>
+<script src="{assets}/graph.js"></script>
+</body>
+</html>
+"""
 
 # Config vars for data
 LANGUAGES = ['en', 'de', 'fr']
@@ -68,6 +189,11 @@ LANGUAGE_TERMS = {
     'de': 'German',
     'fr': 'French'
 }
+ANNOTATIONS = {
+    'description': 'Description',
+    'definition': 'Definition',
+    'example': 'Example'
+}
 PREFIXES = {
     'http://creativecommons.org/ns#': 'cc',
     'http://purl.org/dc/elements/1.1/': 'dc',
@@ -1,10 +1,29 @@
+import os
+import re
 import sys
+import json
+import math
+import time
+import codecs
+import gzip
+import html
+import hashlib
+import weakref
+import collections
+import asyncio
+import functools
 import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
 import pandas as pd
+import networkx as nx
 from .config import *
 from itables import show
 from pyvis.network import Network
+from pyvis.node import Node
+from pyvis.edge import Edge
 
 
 def __validate_args__(arg, flat=False):
@@ -20,34 +39,293 @@ def __validate_args__(arg, flat=False):
     return True
 
 
-def __flatten__(data, parent={}):
+def __get_class_row__(element, parent):
 
-    resultant = []
+    row = {key: value for key, value in element.items()
+           if key not in ('label', 'cls', 'lang', 'leaf', 'children')}
+    row.update(**parent)
+    row.update({'Label': element.get('label', None)})
+    row.update({'IRI': element.get('cls', None)})
+    row.update({'Language': element.get('lang', '')})
+    row.update({'IsLeafClass': element.get('leaf', False)})
 
-    for element in data:
-        element.update(**parent)
-        resultant.append(element)
-        element.update({'Label': element.pop('label', None)})
-        element.update({'IRI': element.pop('cls', None)})
-        element.update({'Language': element.pop('lang', '')})
-        element.update({'IsLeafClass': element.pop('leaf', False)})
+    return row
 
-        if not element.get('IsLeafClass', None):
-            children = element.pop('children')
-            _parent = {
-                'Superclass label': element.get('Label'),
-                'Superclass IRI': element.get('IRI'),
-                'Superclass language': element.get('Language')
+
+def __get_superclass__(row):
+
+    superclass = {
+        'Superclass label': row.get('Label'),
+        'Superclass IRI': row.get('IRI'),
+        'Superclass language': row.get('Language')
+    }
+
+    return superclass
+
+
+def __flatten__(data, parent=None):
+
+    # Walking the tree depth-first with an explicit stack of the pending
+    # siblings on each level, yielding a new row for every element
+    stack = [(iter(data), parent or {})]
+
+    while stack:
+        elements, parent = stack[-1]
+        element = next(elements, None)
+        if element is None:
+            stack.pop()
+            continue
+
+        row = __get_class_row__(element=element, parent=parent)
+
+        yield row
+
+        if not row.get('IsLeafClass', None):
+            stack.append((iter(element.get('children', [])),
+                          __get_superclass__(row=row)))
+
+
+def __build_frame__(rows):
+
+    # Filling columns while consuming the rows, so that they are never held
+    # as a list of dicts. Columns are ordered by first appearance.
+    columns = {}
+    length = 0
+
+    for row in rows:
+        for key, value in row.items():
+            column = columns.get(key)
+            if column is None:
+                column = columns.setdefault(key, [None] * length)
+            column.append(value)
+        length += 1
+        for column in columns.values():
+            if len(column) < length:
+                column.append(None)
+
+    return pd.DataFrame(columns)
+
+
+class Transport:
+
+    """A pooled HTTP transport shared by the clients.
+
+    Connections are kept alive and reused per host. Requests to the read-only
+    endpoints listed in RETRY_ENDPOINTS are retried with a bounded exponential
+    backoff on connection errors, connect timeouts and the statuses in
+    RETRY_STATUSES. Read timeouts are not retried, as every attempt could
+    wait for REQUEST_TIMEOUT again.
+
+    Args:
+        pool_connections (int, optional): Number of hosts to keep a pool for.
+        Defaults to POOL_CONNECTIONS.
+        pool_maxsize (int, optional): Number of connections kept alive per
+        host. Defaults to POOL_MAXSIZE.
+        max_retries (int, optional): Number of retries for read-only
+        endpoints. Defaults to MAX_RETRIES.
+        backoff_factor (float, optional): Seconds to wait before the first
+        retry, doubled for every further one. Defaults to RETRY_BACKOFF_FACTOR.
+        backoff_max (float, optional): Upper bound in seconds for a single
+        wait. Defaults to RETRY_BACKOFF_MAX.
+    """
+
+    def __init__(self,
+                 pool_connections=POOL_CONNECTIONS,
+                 pool_maxsize=POOL_MAXSIZE,
+                 max_retries=MAX_RETRIES,
+                 backoff_factor=RETRY_BACKOFF_FACTOR,
+                 backoff_max=RETRY_BACKOFF_MAX):
+
+        self.pool_maxsize = pool_maxsize
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+
+        adapter = HTTPAdapter(pool_connections=pool_connections,
+                              pool_maxsize=pool_maxsize)
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def post(self, url, **kwargs):
+
+        """It sends a POST request, retrying it if the endpoint is read-only.
+
+        Args:
+            url (string): The URL to post to.
+            **kwargs: Arguments passed on to requests.Session.post.
+
+        Returns:
+            Response: The response of the last attempt.
+        """
+
+        endpoint = url.rstrip('/').rsplit('/', 1)[-1]
+        retries = self.max_retries if endpoint in RETRY_ENDPOINTS else 0
+
+        attempt = 0
+        while True:
+            try:
+                response = self.session.post(url=url, **kwargs)
+            except requests.exceptions.ConnectionError:
+                # Includes ConnectTimeout, but not ReadTimeout
+                if attempt >= retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or \
+                        attempt >= retries:
+                    return response
+                response.close()
+
+            time.sleep(min(self.backoff_max,
+                           self.backoff_factor * 2 ** attempt))
+            attempt += 1
+
+    def close(self):
+
+        """It closes all pooled connections."""
+
+        self.session.close()
+
+
+__transport__ = None
+
+
+def __get_transport__():
+
+    global __transport__
+
+    if __transport__ is None:
+        __transport__ = Transport()
+
+    return __transport__
+
+
+class TTLCache:
+
+    """A bounded in-process cache whose entries expire after a time to live.
+
+    Once `maxsize` entries are held, the least recently used one is evicted.
+    Hits, misses and evictions are counted for the stats.
+
+    Args:
+        maxsize (int): Maximum number of entries.
+        ttl (float): Seconds after which an entry expires.
+    """
+
+    def __init__(self, maxsize, ttl):
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+
+        """It looks up a key, refreshing its recency on a hit.
+
+        Args:
+            key (hashable): The key to look up.
+            default (optional): Value returned on a miss. Defaults to None.
+
+        Returns:
+            The cached value, or `default` if it is missing or expired.
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None:
+                expiry, value = entry
+                if time.monotonic() < expiry:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+
+        """It stores a value, evicting the least recently used entries.
+
+        Args:
+            key (hashable): The key to store the value under.
+            value: The value to store.
+        """
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, predicate=None):
+
+        """It removes entries from the cache.
+
+        Args:
+            predicate (function, optional): Called with each key, the entry is
+            removed if it returns True. Removes all entries if None.
+            Defaults to None.
+        """
+
+        with self._lock:
+            if predicate is None:
+                self._entries.clear()
+                return
+
+            for key in [key for key in self._entries if predicate(key)]:
+                del self._entries[key]
+
+    @property
+    def stats(self):
+
+        """dict: Hits, misses, evictions and size of the cache."""
+
+        with self._lock:
+            lookups = self.hits + self.misses
+
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'maxsize': self.maxsize
             }
-            resultant += __flatten__(data=children, parent=_parent)
 
-    return resultant
+
+# Properties of classes shared by all clients, keyed by (tenant, IRI)
+__properties_cache__ = TTLCache(maxsize=PROPERTIES_CACHE_SIZE,
+                                ttl=PROPERTIES_CACHE_TTL)
 
 
-def __get_access_token__(tenant, username, password):
+def __get_token__(transport, tenant, body, silent=False):
 
     url = f'{BASE_URL}/auth/realms/{tenant}/protocol/openid-connect/token'
 
+    try:
+        response = transport.post(url=url, data=body, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+    except requests.exceptions.RequestException as exception:
+        if not silent:
+            sys.stdout.write(str(exception))
+        return None
+
+    token = response.json()
+
+    return token
+
+
+def __get_access_token__(transport, tenant, username, password):
+
     body = {
         'grant_type': 'password',
         'client_id': 'enapso-sdk',
@@ -55,20 +333,171 @@ def __get_access_token__(tenant, username, password):
         'password': password
     }
 
-    try:
-        response = requests.post(url=url, data=body, timeout=REQUEST_TIMEOUT)
-        response.raise_for_status()
-    except requests.exceptions.RequestException as exception:
-        sys.stdout.write(str(exception))
-        return None
+    return __get_token__(transport=transport, tenant=tenant, body=body)
+
+
+def __refresh_access_token__(transport, tenant, refresh_token):
+
+    body = {
+        'grant_type': 'refresh_token',
+        'client_id': 'enapso-sdk',
+        'refresh_token': refresh_token
+    }
 
-    access_token = response.json()
-    access_token = access_token.get('access_token')
+    # A rejected refresh token is not an error, the caller logs in again
+    return __get_token__(
+        transport=transport, tenant=tenant, body=body, silent=True)
+
+
+# Members of a class element, as far as they hold no brackets outside of
+# strings. Strings are matched a character at a time, so that one cut off
+# at the end of the buffer fails in linear time.
+__class_members_pattern__ = re.compile(
+    r'(?:[^"{}\[\]]+|"(?:[^"\\]|\\.)*")*')
+__children_key_pattern__ = re.compile(r',?\s*"children"\s*:\s*$')
+__separator_pattern__ = re.compile(r'[\s,]*')
+
+
+def __iterate_classes__(response):
+
+    # Flattening the class tree of a streamed body while it is read, without
+    # holding the body or the decoded tree. A class whose subtree fits into
+    # STREAM_WINDOW_SIZE characters is decoded at once and handed to
+    # __flatten__. For a larger one, the members up to its children are
+    # decoded, its row is yielded, and its children are read next, like
+    # __flatten__ walks a decoded tree.
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    chunks = response.iter_content(chunk_size=STREAM_CHUNK_SIZE)
+    buffer = ''
+    position = 0
+
+    def read(size):
+        # Returns False once the body is exhausted and nothing was added.
+        # Dropping what was consumed keeps the buffer about a chunk long.
+        nonlocal buffer, position
+        buffer = buffer[position:]
+        position = 0
+        start = len(buffer)
+        for chunk in chunks:
+            buffer += text_decoder.decode(chunk)
+            if len(buffer) >= start + size:
+                return True
+        buffer += text_decoder.decode(b'', final=True)
+        return len(buffer) > start
+
+    def need():
+        # Reading at least as much again as is pending keeps the work linear
+        if not read(max(STREAM_CHUNK_SIZE, len(buffer) - position)):
+            raise json.JSONDecodeError(
+                'Unexpected end of the body', buffer, len(buffer))
+
+    def members(offset=0):
+        # Matching the members from past the position up to a bracket, whose
+        # position is returned along with them
+        while True:
+            start = position + offset
+            end = __class_members_pattern__.match(buffer, start).end()
+            if end < len(buffer) and buffer[end] in '{}[]':
+                return buffer[start:end], end
+            need()
+
+    def skip():
+        # Decoding and dropping the value at the position
+        nonlocal position
+        while True:
+            try:
+                value, position = decoder.raw_decode(buffer, position)
+                return value
+            except json.JSONDecodeError:
+                need()
+
+    def close():
+        # Dropping the members left in a class, up to its end. Members after
+        # the children of a large class come after its row was yielded, the
+        # backend sends the children last.
+        nonlocal position
+        while True:
+            _, position = members()
+            if buffer[position] == '}':
+                position += 1
+                return
+            skip()
 
-    return access_token
+    try:
+        while True:
+            match = re.search(r'"records"\s*:\s*\[', buffer)
+            if match:
+                position = match.end()
+                break
+            if not read(STREAM_CHUNK_SIZE):
+                return
+
+        # The superclasses of the arrays of classes being read, innermost
+        # last
+        parents = [{}]
+
+        while parents:
+            position = __separator_pattern__.match(buffer, position).end()
+            if position >= len(buffer):
+                need()
+                continue
+
+            if buffer[position] == ']':
+                position += 1
+                parents.pop()
+                if parents:
+                    close()
+                continue
+
+            if buffer[position] != '{':
+                raise json.JSONDecodeError(
+                    'Expecting a class', buffer, position)
+
+            # Decoding fails for a larger subtree after one window at most,
+            # which keeps the scanning linear
+            if len(buffer) - position < STREAM_WINDOW_SIZE:
+                read(STREAM_CHUNK_SIZE)
+            try:
+                element, end = decoder.raw_decode(
+                    buffer[position:position + STREAM_WINDOW_SIZE])
+            except json.JSONDecodeError:
+                element = None
+
+            if element is not None:
+                position += end
+                yield from __flatten__(data=[element], parent=parents[-1])
+                continue
+
+            head, end = members(offset=1)
+            children = __children_key_pattern__.search(head) \
+                if buffer[end] == '[' else None
+
+            if buffer[end] == '}':
+                position = end + 1
+                element = json.loads('{' + head + '}')
+                yield __get_class_row__(element=element, parent=parents[-1])
+            elif children:
+                position = end
+                element = json.loads('{' + head[:children.start()] + '}')
+                row = __get_class_row__(element=element, parent=parents[-1])
+                yield row
+                if row.get('IsLeafClass', None):
+                    # The children of leaf classes are not walked, see
+                    # __flatten__
+                    skip()
+                    close()
+                else:
+                    position += 1
+                    parents.append(__get_superclass__(row=row))
+            else:
+                element = skip()
+                yield from __flatten__(data=[element], parent=parents[-1])
+    finally:
+        response.close()
 
 
-def __get_all_classes__(access_token):
+def __get_all_classes__(transport, access_token):
 
     url = f'{BASE_URL}{ENAPSO_NAMESPACE}/v1/get-all-classes'
 
@@ -82,20 +511,23 @@ def __get_all_classes__(access_token):
             'graph': SOURCE_GRAPH,
         }
 
-        response = requests.post(
-            url=url, headers=headers, json=body, timeout=REQUEST_TIMEOUT)
+        response = transport.post(url=url,
+                                  headers=headers,
+                                  json=body,
+                                  timeout=REQUEST_TIMEOUT,
+                                  stream=True)
         response.raise_for_status()
     except requests.exceptions.RequestException as exception:
-        sys.stdout.write(exception)
+        sys.stdout.write(str(exception))
         return None
 
-    classes = response.json()
-    classes = __flatten__(classes.get('records'))
+    classes = __iterate_classes__(response=response)
 
     return classes
 
 
-def __get_descriptions__(access_token):
+def __execute_template__(transport, access_token, template, variables=None):
+
     url = f'{BASE_URL}{TEMPLATE_NAMESPACE}/v1/execute-template'
 
     headers = {
@@ -103,122 +535,63 @@ def __get_descriptions__(access_token):
         'x-enapso-auth': access_token
     }
 
-    try:
-        body = {
-            "template": "http://www.ebu.ch/metadata/ontologies/ebucoreplus#SPARQLTemplate_e5e398b0-f9de-417a-b5c1-39f793f30f9d"
-            }
-        
-        response = requests.post(
-            url=url, headers=headers, json=body, timeout=REQUEST_TIMEOUT)
-        response.raise_for_status()
-    except requests.exceptions.RequestException as exception:
-        sys.stdout.write(str(exception))
-        return None
+    body = {'template': template}
+    if variables:
+        body.update({'variables': variables})
 
-    descriptions = response.json()
-    descriptions = descriptions.get('records')
+    response = transport.post(
+        url=url, headers=headers, json=body, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
 
-    descriptions_ = {}
-    for item in descriptions:
-        if not item.get('descriptionLang', None) and \
-                not item.get('description', None):
-            continue
-        entity = item.get('entity')
-        if entity in descriptions_:
-            descriptions_.get(entity).update(
-                {item.get('descriptionLang'): item.get('description')})
-        else:
-            descriptions_.update(
-                {entity: {item.get('descriptionLang'):
-                          item.get('description')}})
-    return descriptions_
+    records = response.json()
+    records = records.get('records')
 
-def __get_definitions__(access_token):
-    url = f'{BASE_URL}{TEMPLATE_NAMESPACE}/v1/execute-template'
+    return records
 
-    headers = {
-        'Content-Type': 'application/json',
-        'x-enapso-auth': access_token
-    }
+
+def __get_annotations__(transport, access_token):
 
     try:
-        body = {
-            "template": "http://www.ebu.ch/metadata/ontologies/ebucoreplus#SPARQLTemplate_e5e398b0-f9de-417a-b5c1-39f793f30f9d"
-            }
-        
-        response = requests.post(
-            url=url, headers=headers, json=body, timeout=REQUEST_TIMEOUT)
-        response.raise_for_status()
+        records = __execute_template__(transport=transport,
+                                       access_token=access_token,
+                                       template=ANNOTATION_TEMPLATE)
     except requests.exceptions.RequestException as exception:
         sys.stdout.write(str(exception))
         return None
 
-    definitions = response.json()
-    definitions = definitions.get('records')
+    # One pass over the records fills the maps of all annotation kinds
+    annotations = {kind: {} for kind in ANNOTATIONS}
+    for item in records:
+        entity = item.get('entity')
+        for kind, annotations_ in annotations.items():
+            language = item.get(f'{kind}Lang', None)
+            value = item.get(kind, None)
+            if not language and not value:
+                continue
+            annotations_.setdefault(entity, {}).update({language: value})
 
-    definitions = response.json()
-    definitions = definitions.get('records')
+    return annotations
 
-    definitions_ = {}
-    for item in definitions:
-        if not item.get('definitionLang', None) and \
-                not item.get('definition', None):
-            continue
-        entity = item.get('entity')
-        if entity in definitions_:
-            definitions_.get(entity).update(
-                {item.get('definitionLang'): item.get('definition')})
-        else:
-            definitions_.update(
-                {entity: {item.get('definitionLang'):
-                          item.get('definition')}})
-    return definitions_
 
-def __get_examples__(access_token):
-    url = f'{BASE_URL}{TEMPLATE_NAMESPACE}/v1/execute-template'
+def __remove_nans__(df):
 
-    headers = {
-        'Content-Type': 'application/json',
-        'x-enapso-auth': access_token
-    }
+    for column in list(df.columns):
+        df[column] = df[column].fillna('')
 
-    try:
-        body = {
-            "template": "http://www.ebu.ch/metadata/ontologies/ebucoreplus#SPARQLTemplate_e5e398b0-f9de-417a-b5c1-39f793f30f9d"
-            }
-        
-        response = requests.post(
-            url=url, headers=headers, json=body, timeout=REQUEST_TIMEOUT)
-        response.raise_for_status()
-    except requests.exceptions.RequestException as exception:
-        sys.stdout.write(str(exception))
-        return None
+    return df
 
-    examples = response.json()
-    examples = examples.get('records')
 
-    examples_ = {}
-    for item in examples:
-        if not item.get('exampleLang', None) and \
-                not item.get('example', None):
-            continue
-        entity = item.get('entity')
-        if entity in examples_:
-            examples_.get(entity).update(
-                {item.get('exampleLang'): item.get('example')})
-        else:
-            examples_.update(
-                {entity: {item.get('exampleLang'):
-                          item.get('example')}})
-    return examples_
-def __remove_nans__(df):
+def __compact__(df):
 
+    # Repeated strings are stored once per distinct value, as categories
     for column in list(df.columns):
-        df[column] = df[column].fillna('')
+        if df[column].dtype == object:
+            df[column] = df[column].astype('category')
 
     return df
 
 
+@functools.lru_cache(maxsize=IRI_CACHE_SIZE)
 def __get_name_from_iri__(iri):
 
     name = iri.split('#')[-1]
@@ -235,14 +608,247 @@ def __get_names_from_iris__(iris):
     return names
 
 
-def __acquire_properties__(tenant, username, password, iri):
+def __get_string_mask__(values):
 
-    properties = get_properties(tenant=tenant,
-                                username=username,
-                                password=password,
-                                iri=iri,
-                                show_table=False,
-                                raw=True)
+    # Only strings go through the str accessor, other values are kept
+    return values.map(lambda value: isinstance(value, str)).to_numpy(
+        dtype=bool)
+
+
+class PrefixEngine:
+
+    """Compacts IRIs to prefixed names and expands them back.
+
+    The namespaces may end in '#', '/' or anything else. An IRI is compacted
+    with the longest namespace it starts with, found with one dictionary
+    lookup per distinct namespace length. Single values are memoized, Series
+    are handled with one regular expression over all their values.
+
+    Args:
+        prefixes (dict): Prefixes keyed by namespace, such as PREFIXES.
+    """
+
+    def __init__(self, prefixes):
+
+        self.prefixes = dict(prefixes)
+        self.namespaces = {prefix: namespace
+                           for namespace, prefix in self.prefixes.items()}
+        self.lengths = sorted({len(namespace) for namespace in self.prefixes},
+                              reverse=True)
+
+        # Alternatives are tried in order, so the longest namespaces go first
+        alternatives = '|'.join(
+            re.escape(namespace) for namespace in
+            sorted(self.prefixes, key=len, reverse=True))
+        self._iri_pattern = re.compile(f'^({alternatives})(.+)$')
+        self._name_pattern = re.compile(r'^([A-Za-z_][\w.-]*):(.*)$')
+
+        self.compact = functools.lru_cache(maxsize=IRI_CACHE_SIZE)(
+            self.compact)
+        self.expand = functools.lru_cache(maxsize=IRI_CACHE_SIZE)(
+            self.expand)
+
+    def compact(self, iri):
+
+        """It compacts an IRI with the longest matching namespace.
+
+        Args:
+            iri (string): The IRI to compact.
+
+        Returns:
+            string: The prefixed name, or the IRI if no namespace matches.
+        """
+
+        for length in self.lengths:
+            prefix = self.prefixes.get(iri[:length])
+            if prefix is not None and len(iri) > length:
+                return f'{prefix}:{iri[length:]}'
+
+        return iri
+
+    def expand(self, name):
+
+        """It expands a prefixed name to its IRI.
+
+        Args:
+            name (string): The prefixed name to expand.
+
+        Returns:
+            string: The IRI, or the name if its prefix is unknown.
+        """
+
+        prefix, separator, local_name = name.partition(':')
+        namespace = self.namespaces.get(prefix) if separator else None
+
+        return namespace + local_name if namespace is not None else name
+
+    def compact_series(self, iris):
+
+        """It compacts a Series of IRIs.
+
+        Args:
+            iris (Series): The IRIs to compact, other values are kept.
+
+        Returns:
+            Series: The prefixed names.
+        """
+
+        if not self.prefixes:
+            return iris.copy()
+
+        values = iris.astype(object)
+        strings = __get_string_mask__(values)
+
+        parts = values[strings].str.extract(self._iri_pattern)
+        compacted = parts[0].map(self.prefixes) + ':' + parts[1]
+        compacted = compacted.where(parts[0].notna(), values[strings])
+
+        values[strings] = compacted.to_numpy()
+
+        return values
+
+    def expand_series(self, names):
+
+        """It expands a Series of prefixed names.
+
+        Args:
+            names (Series): The prefixed names to expand, other values are
+            kept.
+
+        Returns:
+            Series: The IRIs.
+        """
+
+        values = names.astype(object)
+        strings = __get_string_mask__(values)
+
+        parts = values[strings].str.extract(self._name_pattern)
+        expanded = parts[0].map(self.namespaces) + parts[1]
+        expanded = expanded.where(expanded.notna(), values[strings])
+
+        values[strings] = expanded.to_numpy()
+
+        return values
+
+
+__prefixes__ = PrefixEngine(prefixes=PREFIXES)
+
+
+def compact_iri(iri):
+
+    """It compacts an IRI to a prefixed name, such as 'ec:EditorialObject'.
+
+    Args:
+        iri (string): The IRI to compact.
+
+    Returns:
+        string: The prefixed name, or the IRI if no prefix of PREFIXES
+        matches.
+    """
+
+    return __prefixes__.compact(iri)
+
+
+def expand_iri(name):
+
+    """It expands a prefixed name, such as 'ec:EditorialObject', to its IRI.
+
+    Args:
+        name (string): The prefixed name to expand.
+
+    Returns:
+        string: The IRI, or the name if its prefix is not in PREFIXES.
+    """
+
+    return __prefixes__.expand(name)
+
+
+def compact_iris(iris):
+
+    """It compacts a Series of IRIs to prefixed names at once.
+
+    Args:
+        iris (Series): The IRIs to compact.
+
+    Returns:
+        Series: The prefixed names, values without a prefix of PREFIXES are
+        kept.
+    """
+
+    return __prefixes__.compact_series(iris)
+
+
+def expand_iris(names):
+
+    """It expands a Series of prefixed names to IRIs at once.
+
+    Args:
+        names (Series): The prefixed names to expand.
+
+    Returns:
+        Series: The IRIs, values without a prefix of PREFIXES are kept.
+    """
+
+    return __prefixes__.expand_series(names)
+
+
+def __get_model_fingerprint__():
+
+    # Everything on this side which shapes the DataFrame of load_model. It
+    # reflects nothing of the ontology on the server.
+    definition = {
+        'version': SNAPSHOT_VERSION,
+        'languages': LANGUAGES,
+        'language_terms': LANGUAGE_TERMS,
+        'annotations': ANNOTATIONS,
+        'annotation_template': ANNOTATION_TEMPLATE
+    }
+    definition = json.dumps(definition, sort_keys=True).encode('utf-8')
+
+    return hashlib.sha1(definition).hexdigest()
+
+
+def __get_snapshot_path__(tenant, part=None):
+
+    # Keyed by backend as well, as the same tenant may exist on several
+    key = '\n'.join([BASE_URL, ENAPSO_NAMESPACE, tenant, SOURCE_GRAPH,
+                      __get_model_fingerprint__()])
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+    tenant_ = re.sub(r'[^A-Za-z0-9_.-]', '_', tenant)
+    part_ = f'.{part}' if part else ''
+
+    return os.path.join(SNAPSHOT_DIR, f'{tenant_}-{digest}{part_}.parquet')
+
+
+def __read_snapshot__(tenant, ttl, part=None):
+
+    path = __get_snapshot_path__(tenant=tenant, part=part)
+
+    try:
+        if time.time() - os.path.getmtime(path) > ttl:
+            return None
+        return pd.read_parquet(path)
+    except (OSError, ValueError):
+        return None
+
+
+def __write_snapshot__(tenant, df, part=None):
+
+    path = __get_snapshot_path__(tenant=tenant, part=part)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # Writing next to the target first, so readers never see a partial file
+    temporary_path = f'{path}.{uuid.uuid4()}.tmp'
+    try:
+        df.to_parquet(temporary_path, index=False)
+        os.replace(temporary_path, path)
+    except (OSError, ValueError) as exception:
+        sys.stdout.write(str(exception))
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+
+
+def __group_properties__(properties):
 
     properties_ = {}
 
@@ -272,12 +878,24 @@ def __acquire_properties__(tenant, username, password, iri):
     return properties_
 
 
-def __acquire_description__(tenant, username, password):
+def __acquire_properties__(client, iris):
+
+    properties = client.get_concurrent_properties(iris=iris)
+
+    properties_ = {iri: __group_properties__(properties=value)
+                   for iri, value in properties.items()}
+
+    return properties_
+
+
+def __acquire_description__(client, source_df):
 
-    access_token = __get_access_token__(
-        tenant=tenant, username=username, password=password)
+    store = get_annotation_store(source_df=source_df)
+    if store is not None:
+        return store.get_kind('description')
 
-    descriptions = __get_descriptions__(access_token=access_token)
+    annotations = client.get_annotations()
+    descriptions = annotations.get('description') if annotations else {}
 
     return descriptions
 
@@ -298,15 +916,803 @@ def itable_config(opt, init_notebook_mode):
     init_notebook_mode(all_interactive=True)
 
 
-def get_individuals(tenant, username, password, iri, show_table=True):
+class OntologyClient:
 
-    """It acquires individuals for the given IRI.
+    """A stateful client holding the credentials of a tenant.
+
+    The access token is cached until it is about to expire and is then
+    renewed with the refresh token. A new login is only made once the refresh
+    token has expired as well.
 
     Args:
         tenant (string): Tenant id to access API.
         username (string): Username to access API.
         password (string): Password to access API.
-        iri (string): The IRI to query individuals for.
+        transport (Transport, optional): Transport to send requests with.
+        Defaults to the transport shared by all clients.
+        properties_cache (TTLCache, optional): Cache for the properties of
+        classes. Defaults to the cache shared by all clients.
+    """
+
+    def __init__(self,
+                 tenant,
+                 username,
+                 password,
+                 transport=None,
+                 properties_cache=None):
+
+        self.tenant = tenant
+        self.username = username
+        self.password = password
+        self.transport = transport or __get_transport__()
+        self.properties_cache = properties_cache or __properties_cache__
+
+        self._token = {}
+        self._access_expiry = 0
+        self._refresh_expiry = 0
+        self._lock = threading.Lock()
+
+    @property
+    def access_token(self):
+
+        """str: A valid access token, or None if the login failed."""
+
+        with self._lock:
+            now = time.monotonic()
+
+            if self._token.get('access_token') and now < self._access_expiry:
+                return self._token.get('access_token')
+
+            token = None
+            if self._token.get('refresh_token') and \
+                    now < self._refresh_expiry:
+                token = __refresh_access_token__(
+                    transport=self.transport,
+                    tenant=self.tenant,
+                    refresh_token=self._token.get('refresh_token'))
+            if not token:
+                token = __get_access_token__(transport=self.transport,
+                                             tenant=self.tenant,
+                                             username=self.username,
+                                             password=self.password)
+            if not token:
+                self.invalidate_token()
+                return None
+
+            # Renewing a bit earlier so a token never expires mid-request
+            self._token = token
+            self._access_expiry = now + \
+                token.get('expires_in', 0) - TOKEN_EXPIRY_MARGIN
+            self._refresh_expiry = now + \
+                token.get('refresh_expires_in', 0) - TOKEN_EXPIRY_MARGIN
+
+            return token.get('access_token')
+
+    def invalidate_token(self):
+
+        """It discards the cached tokens, forcing a new login."""
+
+        self._token = {}
+        self._access_expiry = 0
+        self._refresh_expiry = 0
+
+    def get_individuals(self, iri, show_table=True):
+
+        """It acquires individuals for the given IRI.
+
+        Args:
+            iri (string): The IRI to query individuals for.
+            show_table (bool, optional): Flag for displaying the table.
+            Defaults to True.
+
+        Returns:
+            (DataFrame, optional): The DataFrame holding the individuals.
+        """
+
+        __validate_args__(arg=iri, flat=True)
+
+        url = f'{BASE_URL}{INDIVIDUAL_NAMESPACE}/v1/read-individual'
+
+        headers = {
+            'Content-Type': 'application/json',
+            'x-enapso-auth': self.access_token
+        }
+
+        try:
+            body = {'cls': iri}
+            response = self.transport.post(
+                url=url, headers=headers, json=body, timeout=REQUEST_TIMEOUT)
+            response.raise_for_status()
+        except requests.exceptions.RequestException as exception:
+            return False, str(exception)
+
+        individuals = response.json()
+        individuals = individuals.get('records')
+        individuals_df = pd.DataFrame(data=individuals)
+
+        name = __get_name_from_iri__(iri)
+
+        column_display_names = {
+            'iri': 'IRI',
+            'alternativeTitle': 'ec:alternativeTitle',
+            'contentDescription': 'ec:contentDescription'
+        }
+
+        if show_table:
+            title=f'Individuals of class {name}'
+            show(df=individuals_df,
+                 columnDefs=[ITABLE_COLDEF],
+                 eval_functions=True,
+                 tags=ITABLE_TITLE.format(title=title))
+
+        return individuals_df
+
+    def load_model(self,
+                   snapshot=False,
+                   ttl=SNAPSHOT_TTL,
+                   compact=False,
+                   wide=False):
+
+        """It acquires the model for the notebook.
+
+        The descriptions, definitions and examples of the classes are kept in
+        an AnnotationStore carried in the attrs of the returned DataFrame,
+        which its copies and slices keep, see get_annotation_store.
+
+        Args:
+            snapshot (bool, optional): Flag to reuse the model stored on disk
+            by an earlier call, and to store it otherwise. It is stored per
+            backend, tenant and graph, so changes of the ontology are only
+            picked up once ttl expires or after invalidate_snapshot.
+            Defaults to False.
+            ttl (int, optional): Seconds for which a stored model is reused.
+            Defaults to SNAPSHOT_TTL.
+            compact (bool, optional): Flag to store the text columns as
+            categories, which holds every distinct value only once.
+            Defaults to False.
+            wide (bool, optional): Flag to also merge the annotations onto
+            every row, as one column per kind and language.
+            Defaults to False.
+
+        Returns:
+            (DataFrame, optional): The DataFrame holding the model.
+        """
+
+        classes_df = None
+
+        if snapshot:
+            classes_df = __read_snapshot__(tenant=self.tenant, ttl=ttl)
+            annotations_df = __read_snapshot__(
+                tenant=self.tenant, ttl=ttl, part='annotations')
+            if classes_df is not None and annotations_df is not None:
+                store = AnnotationStore.from_frame(annotations_df)
+            else:
+                classes_df = None
+
+        if classes_df is None:
+            access_token = self.access_token
+
+            if not access_token:
+                return None
+
+            classes = __get_all_classes__(transport=self.transport,
+                                          access_token=access_token)
+
+            if classes is None:
+                return None
+
+            # The body is only read while the frame is built, so a dropped
+            # connection or a truncated body surfaces here
+            try:
+                classes_df = __build_frame__(rows=classes)
+            except (requests.exceptions.RequestException,
+                    json.JSONDecodeError) as exception:
+                sys.stdout.write(str(exception))
+                return None
+
+            classes_df = __remove_nans__(classes_df)
+
+            annotations = __get_annotations__(
+                transport=self.transport, access_token=access_token)
+            store = AnnotationStore(annotations=annotations or {})
+
+            # Storing a model without its annotations would serve it without
+            # them for the whole ttl, after the backend has recovered
+            if snapshot and annotations is not None:
+                __write_snapshot__(tenant=self.tenant, df=classes_df)
+                __write_snapshot__(tenant=self.tenant,
+                                   df=store.to_frame(),
+                                   part='annotations')
+
+        if wide:
+            classes_df = store.merge(classes_df)
+
+        if compact:
+            classes_df = __compact__(classes_df)
+
+        __register_annotation_store__(source_df=classes_df, store=store)
+
+        return classes_df
+
+    def invalidate_snapshot(self):
+
+        """It removes the model stored on disk for the tenant."""
+
+        invalidate_snapshot(tenant=self.tenant)
+
+    def get_properties(self, iri, show_table=True, raw=False):
+
+        """It acquires properties for the given IRI.
+
+        Args:
+            iri (string): The IRI to acquire properties for.
+            show_table (bool, optional): Flag for displaying the table.
+            Defaults to True.
+            raw (bool, optional): Flag to get raw data or its DataFrame.
+            Defaults to False.
+
+        Returns:
+            DataFrame: The DataFrame holding the properties.
+        """
+
+        __validate_args__(arg=iri, flat=True)
+
+        key = (self.tenant, iri)
+        properties = self.properties_cache.get(key)
+
+        if properties is None:
+            url = f'{BASE_URL}{ENAPSO_NAMESPACE}/v1/get-class-own-properties'
+
+            headers = {
+                'Content-Type': 'application/json',
+                'x-enapso-auth': self.access_token
+            }
+
+            try:
+                body = {'cls': iri}
+                response = self.transport.post(
+                    url=url, headers=headers, json=body, timeout=REQUEST_TIMEOUT)
+                response.raise_for_status()
+            except requests.exceptions.RequestException as exception:
+                return False
+
+            properties = response.json()
+            properties = properties.get('records')
+            self.properties_cache.set(key, properties)
+
+        if raw:
+            return list(properties)
+
+        properties = pd.DataFrame(data=properties)
+
+        for column in ['prop', 'type', 'range', 'some']:
+            if column in properties.columns:
+                properties[column] = compact_iris(properties[column])
+
+        column_display_names = {
+            'prop': 'Property',
+            'type': 'Type',
+            'range': 'Range',
+            'max': 'owl:maxCardinality',
+            'some': 'owl:someValuesFrom'
+        }
+
+        columns = list(properties.columns)
+        included_columns = ['prop', 'type', 'range']
+
+        if 'max' in columns:
+            included_columns.append('max')
+            properties['max'] = properties['max'].fillna('')
+        if 'some' in columns:
+            included_columns.append('some')
+            properties['some'] = properties['some'].fillna('')
+
+        included_column_display_names = {col: column_display_names.get(
+            col) for col in included_columns}
+        properties = properties[properties.columns[properties.columns.isin(
+            included_columns)]]
+        properties.rename(columns=included_column_display_names, inplace=True)
+        properties.reset_index(drop=True, inplace=True)
+        name = __get_name_from_iri__(iri)
+
+        if show_table:
+            title=f'Properties of class {name}'
+
+            show(df=properties,
+                 columnDefs=[ITABLE_COLDEF],
+                 eval_functions=True,
+                 tags=ITABLE_TITLE.format(title=title))
+
+        return properties
+
+    def execute_template(self, template, variables=None):
+
+        """It executes a SPARQL template of the view management.
+
+        Args:
+            template (string): The IRI of the template.
+            variables (dict, optional): Values for the template variables.
+            Defaults to None.
+
+        Returns:
+            (list, optional): The records returned by the template.
+        """
+
+        try:
+            records = __execute_template__(transport=self.transport,
+                                           access_token=self.access_token,
+                                           template=template,
+                                           variables=variables)
+        except requests.exceptions.RequestException as exception:
+            sys.stdout.write(str(exception))
+            return None
+
+        return records
+
+    def get_annotations(self):
+
+        """It acquires descriptions, definitions and examples of all classes.
+
+        Returns:
+            (dict, optional): The annotations keyed by kind, IRI and language.
+        """
+
+        return __get_annotations__(transport=self.transport,
+                                   access_token=self.access_token)
+
+    def invalidate_properties(self, iri=None):
+
+        """It removes cached properties of the tenant.
+
+        Args:
+            iri (string, optional): The IRI to remove the properties of.
+            Removes the properties of all IRIs if None. Defaults to None.
+        """
+
+        self.properties_cache.invalidate(
+            lambda key: key[0] == self.tenant and iri in (None, key[1]))
+
+    def get_concurrent_properties(self, iris):
+
+        """It acquires the raw properties of several IRIs concurrently.
+
+        It is not a batched request: get-class-own-properties is sent once per
+        IRI, PROPERTIES_WORKERS of them at a time over the pooled transport.
+        Only the wall-clock time drops, to about n / PROPERTIES_WORKERS
+        round-trips for n IRIs. IRIs already cached cost none.
+
+        Args:
+            iris (list): List of IRIs to acquire properties for.
+
+        Returns:
+            dict: The raw properties keyed by IRI. IRIs whose request failed
+            map to an empty list.
+        """
+
+        iris = [iri for iri in dict.fromkeys(iris) if iri]
+
+        if not iris:
+            return {}
+
+        # Logging in once before fanning out
+        self.access_token
+
+        workers = min(PROPERTIES_WORKERS, len(iris))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            properties = executor.map(
+                lambda iri: self.get_properties(
+                    iri=iri, show_table=False, raw=True),
+                iris)
+
+            properties = {iri: value or []
+                          for iri, value in zip(iris, properties)}
+
+        return properties
+
+    def get_hierarchy_graph(self,
+                            source_df,
+                            iris,
+                            show_superclasses,
+                            show_subclasses,
+                            language='en',
+                            verbose_tooltips=True,
+                            max_nodes=None,
+                            max_siblings=None,
+                            layout=None):
+
+        """It generates a Network object of the class hierarchy for the given
+        list of IRIs.
+
+        Args:
+            source_df (DataFrame): Primary DataFrame to query from.
+            iris (list): List of IRIs to query.
+            show_superclasses (bool): Flag to extract superclasses for the
+            queried IRIs.
+            show_subclasses (bool): Flag to extract subclasses for the queried
+            IRIs.
+            language (str, optional): Language to query for. Could accept
+            either of these: 'en', 'de', and 'fr'.
+            Defaults to 'en'.
+            verbose_tooltips (bool, optional): Flag to display extended
+            tooltip. Defaults to True.
+            max_nodes (int, optional): Budget of class nodes. Surplus
+            subclasses of the queried classes are collapsed into one node per
+            superclass. Defaults to None.
+            max_siblings (int, optional): Subclasses shown per queried class
+            before the rest are collapsed into one node. Defaults to None.
+            layout (str, optional): Layout computed before rendering, with
+            physics disabled. Could accept either of these: 'hierarchical',
+            'radial', 'circular', 'shell', 'spring' and 'kamada_kawai'.
+            Physics lays out the graph if None. Defaults to None.
+
+        Returns:
+            Network: The Network object loaded with nodes and edges to display.
+        """
+
+        graph = __get_network_graph__(client=self,
+                                      source_df=source_df,
+                                      iris=iris,
+                                      show_superclasses=show_superclasses,
+                                      show_subclasses=show_subclasses,
+                                      show_properties=False,
+                                      language=language,
+                                      verbose_tooltips=verbose_tooltips,
+                                      max_nodes=max_nodes,
+                                      max_siblings=max_siblings,
+                                      layout=layout)
+        return graph
+
+    def get_properties_graph(self,
+                             source_df,
+                             iris,
+                             show_superclasses=False,
+                             show_subclasses=False,
+                             language='en',
+                             verbose_tooltips=False,
+                             merge_datatypes=False,
+                             max_nodes=None,
+                             max_siblings=None,
+                             aggregate_datatypes=False,
+                             layout=None):
+
+        """It generates a Network object of the class properties for the given
+        list of IRIs.
+
+        Args:
+            source_df (DataFrame): Primary DataFrame to query from.
+            iris (list): List of IRIs to query.
+            show_superclasses (bool, optional): Flag to extract superclasses
+            for the queried IRIs. Defaults to False.
+            show_subclasses (bool, optional): Flag to extract subclasses for
+            the queried IRIs. Defaults to False.
+            language (str, optional): Language to query for. Could accept
+            either of these: 'en', 'de', and 'fr'.
+            Defaults to 'en'.
+            verbose_tooltips (bool, optional): Flag to display extended
+            tooltip. Defaults to False.
+            merge_datatypes (bool, optional): Flag to show a datatype property
+            shared by several classes as one node. Defaults to False.
+            max_nodes (int, optional): Budget of class nodes. Surplus
+            subclasses of the queried classes are collapsed into one node per
+            superclass. Defaults to None.
+            max_siblings (int, optional): Subclasses shown per queried class
+            before the rest are collapsed into one node. Defaults to None.
+            aggregate_datatypes (bool, optional): Flag to show the datatype
+            properties of a class as one node. Also set if the properties
+            would exceed max_nodes. Defaults to False.
+            layout (str, optional): Layout computed before rendering, with
+            physics disabled. Could accept either of these: 'hierarchical',
+            'radial', 'circular', 'shell', 'spring' and 'kamada_kawai'.
+            Physics lays out the graph if None. Defaults to None.
+
+        Returns:
+            Network: The Network object loaded with nodes and edges to display.
+        """
+
+        graph = __get_network_graph__(client=self,
+                                      source_df=source_df,
+                                      iris=iris,
+                                      show_superclasses=show_superclasses,
+                                      show_subclasses=show_subclasses,
+                                      show_properties=True,
+                                      language=language,
+                                      verbose_tooltips=verbose_tooltips,
+                                      merge_datatypes=merge_datatypes,
+                                      max_nodes=max_nodes,
+                                      max_siblings=max_siblings,
+                                      aggregate_datatypes=aggregate_datatypes,
+                                      layout=layout)
+        return graph
+
+    def get_graph_session(self,
+                          source_df,
+                          language='en',
+                          verbose_tooltips=False,
+                          merge_datatypes=False,
+                          max_nodes=None,
+                          max_siblings=None,
+                          aggregate_datatypes=False,
+                          layout=None):
+
+        """It starts an empty graph which grows by expanding classes.
+
+        Args:
+            source_df (DataFrame): Primary DataFrame to query from.
+            language (str, optional): Language to query for. Could accept
+            either of these: 'en', 'de', and 'fr'.
+            Defaults to 'en'.
+            verbose_tooltips (bool, optional): Flag to display extended
+            tooltip. Defaults to False.
+            merge_datatypes (bool, optional): Flag to show a datatype property
+            shared by several classes as one node. Defaults to False.
+            max_nodes (int, optional): Budget of class nodes added per
+            expansion. Defaults to None.
+            max_siblings (int, optional): Subclasses shown per expanded class
+            before the rest are collapsed into one node. Defaults to None.
+            aggregate_datatypes (bool, optional): Flag to show the datatype
+            properties of a class as one node. Defaults to False.
+            layout (str, optional): Layout computed before rendering, with
+            physics disabled, see get_hierarchy_graph. Defaults to None.
+
+        Returns:
+            GraphSession: The session, see GraphSession.expand.
+        """
+
+        return GraphSession(client=self,
+                            source_df=source_df,
+                            language=language,
+                            verbose_tooltips=verbose_tooltips,
+                            merge_datatypes=merge_datatypes,
+                            max_nodes=max_nodes,
+                            max_siblings=max_siblings,
+                            aggregate_datatypes=aggregate_datatypes,
+                            layout=layout)
+
+    def create_character_graph(self, iri):
+
+        """It generates a Network object of the property values of the given
+        individual.
+
+        Args:
+            iri (string): The IRI of the individual.
+
+        Returns:
+            Network: The Network object loaded with nodes and edges to display.
+        """
+
+        __validate_args__(arg=iri, flat=True)
+        net = Network(height=GRAPH_HEIGHT, width=GRAPH_WIDTH,
+                        directed=True,notebook=True)
+
+        net.repulsion(node_distance=NODE_DISTANCE, spring_length=SPRING_LENGTH)
+
+        try:
+            individuals = __execute_template__(
+                transport=self.transport,
+                access_token=self.access_token,
+                template=INDIVIDUAL_TEMPLATE,
+                variables={'individualIRI': iri})
+        except requests.exceptions.RequestException as exception:
+            return False, str(exception)
+
+        if not individuals:
+            return net
+
+        main_node_value = __get_name_from_iri__(individuals[0]['className'])
+
+        if main_node_value is None:
+            return net
+
+        net.add_node(main_node_value, title=iri , color="#fcfcfc" , size=50 )
+
+
+        for obj in individuals:
+            nodeTitle=f"{str(obj['propertyValue'])}\n({__get_name_from_iri__(obj['property'])})"
+            if obj['propertyType'] == "http://www.w3.org/2002/07/owl#DatatypeProperty":
+                net.add_node( nodeTitle, color=DATATYPE_NODE_COLOR, title="Data Property"  , size=40 )
+            else:
+                net.add_node(nodeTitle, color="#ABEBC6", title="Object Property", size= 40)
+            net.add_edge(main_node_value, nodeTitle)
+
+
+        return net
+
+
+class AsyncOntologyClient:
+
+    """An asyncio variant of OntologyClient.
+
+    Requests are sent over the pooled transport from worker threads, so
+    independent requests run concurrently while the event loop stays free.
+    At most `concurrency` requests are in flight at a time, never more than
+    the transport keeps connections for. Inside Jupyter the coroutines can be
+    awaited directly in a cell, on the kernel's own loop. Used as an async
+    context manager, the worker threads are shut down on exit.
+
+    Args:
+        tenant (string): Tenant id to access API.
+        username (string): Username to access API.
+        password (string): Password to access API.
+        transport (Transport, optional): Transport to send requests with.
+        Defaults to the transport shared by all clients.
+        concurrency (int, optional): Maximum number of concurrent requests,
+        clamped to the pool size of the transport. Defaults to
+        ASYNC_CONCURRENCY.
+    """
+
+    def __init__(self,
+                 tenant,
+                 username,
+                 password,
+                 transport=None,
+                 concurrency=ASYNC_CONCURRENCY):
+
+        self.client = OntologyClient(tenant=tenant,
+                                     username=username,
+                                     password=password,
+                                     transport=transport)
+        # More workers than pooled connections would make urllib3 discard
+        # the connections returned beyond the pool size.
+        self.concurrency = max(1, min(concurrency,
+                                      self.client.transport.pool_maxsize))
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency)
+
+    async def __aenter__(self):
+
+        return self
+
+    async def __aexit__(self, *exc_info):
+
+        self.close()
+
+    async def __run__(self, function, **kwargs):
+
+        loop = asyncio.get_running_loop()
+
+        return await loop.run_in_executor(
+            self._executor, functools.partial(function, **kwargs))
+
+    async def load_model(self,
+                         snapshot=False,
+                         ttl=SNAPSHOT_TTL,
+                         compact=False,
+                         wide=False):
+
+        """It acquires the model for the notebook.
+
+        Args:
+            snapshot (bool, optional): Flag to reuse the model stored on disk
+            by an earlier call, and to store it otherwise. It is stored per
+            backend, tenant and graph, so changes of the ontology are only
+            picked up once ttl expires or after invalidate_snapshot.
+            Defaults to False.
+            ttl (int, optional): Seconds for which a stored model is reused.
+            Defaults to SNAPSHOT_TTL.
+            compact (bool, optional): Flag to store the text columns as
+            categories. Defaults to False.
+            wide (bool, optional): Flag to also merge the annotations onto
+            every row. Defaults to False.
+
+        Returns:
+            (DataFrame, optional): The DataFrame holding the model.
+        """
+
+        return await self.__run__(self.client.load_model,
+                                  snapshot=snapshot,
+                                  ttl=ttl,
+                                  compact=compact,
+                                  wide=wide)
+
+    async def get_properties(self, iri, raw=False):
+
+        """It acquires properties for the given IRI.
+
+        Args:
+            iri (string): The IRI to acquire properties for.
+            raw (bool, optional): Flag to get raw data or its DataFrame.
+            Defaults to False.
+
+        Returns:
+            DataFrame: The DataFrame holding the properties.
+        """
+
+        return await self.__run__(
+            self.client.get_properties, iri=iri, show_table=False, raw=raw)
+
+    async def get_concurrent_properties(self, iris):
+
+        """It acquires the raw properties of several IRIs concurrently.
+
+        Args:
+            iris (list): List of IRIs to acquire properties for.
+
+        Returns:
+            dict: The raw properties keyed by IRI. IRIs whose request failed
+            map to an empty list.
+        """
+
+        iris = [iri for iri in dict.fromkeys(iris) if iri]
+
+        properties = await asyncio.gather(
+            *[self.get_properties(iri=iri, raw=True) for iri in iris])
+
+        return {iri: value or [] for iri, value in zip(iris, properties)}
+
+    async def get_individuals(self, iri):
+
+        """It acquires individuals for the given IRI.
+
+        Args:
+            iri (string): The IRI to query individuals for.
+
+        Returns:
+            (DataFrame, optional): The DataFrame holding the individuals.
+        """
+
+        return await self.__run__(
+            self.client.get_individuals, iri=iri, show_table=False)
+
+    async def execute_template(self, template, variables=None):
+
+        """It executes a SPARQL template of the view management.
+
+        Args:
+            template (string): The IRI of the template.
+            variables (dict, optional): Values for the template variables.
+            Defaults to None.
+
+        Returns:
+            (list, optional): The records returned by the template.
+        """
+
+        return await self.__run__(self.client.execute_template,
+                                  template=template,
+                                  variables=variables)
+
+    async def get_annotations(self):
+
+        """It acquires descriptions, definitions and examples of all classes.
+
+        Returns:
+            (dict, optional): The annotations keyed by kind, IRI and language.
+        """
+
+        return await self.__run__(self.client.get_annotations)
+
+    def close(self):
+
+        """It shuts down the worker threads."""
+
+        self._executor.shutdown(wait=False)
+
+
+# Default clients used by the module-level functions, one per credentials
+__clients__ = {}
+
+
+def __get_client__(tenant, username, password):
+
+    key = (tenant, username, password)
+    client = __clients__.get(key)
+
+    if client is None:
+        client = OntologyClient(tenant=tenant,
+                                username=username,
+                                password=password)
+        __clients__.update({key: client})
+
+    return client
+
+
+def get_individuals(tenant, username, password, iri, show_table=True):
+
+    """It acquires individuals for the given IRI.
+
+    Args:
+        tenant (string): Tenant id to access API.
+        username (string): Username to access API.
+        password (string): Password to access API.
+        iri (string): The IRI to query individuals for.
         show_table (bool, optional): Flag for displaying the table.
         Defaults to True.
 
@@ -314,145 +1720,911 @@ def get_individuals(tenant, username, password, iri, show_table=True):
         (DataFrame, optional): The DataFrame holding the individuals.
     """
 
-    __validate_args__(arg=iri, flat=True)
+    client = __get_client__(tenant=tenant, username=username, password=password)
 
-    url = f'{BASE_URL}{INDIVIDUAL_NAMESPACE}/v1/read-individual'
+    return client.get_individuals(iri=iri, show_table=show_table)
 
-    access_token = __get_access_token__(
-        tenant=tenant, username=username, password=password)
 
-    headers = {
-        'Content-Type': 'application/json',
-        'x-enapso-auth': access_token
-    }
+def load_model(tenant,
+               username,
+               password,
+               snapshot=False,
+               ttl=SNAPSHOT_TTL,
+               compact=False,
+               wide=False):
 
-    try:
-        body = {'cls': iri}
-        response = requests.post(
-            url=url, headers=headers, json=body, timeout=REQUEST_TIMEOUT)
-        response.raise_for_status()
-    except requests.exceptions.RequestException as exception:
-        return False, str(exception)
+    """It acquires the model for the notebook.
+
+    The descriptions, definitions and examples of the classes are kept in an
+    AnnotationStore carried in the attrs of the returned DataFrame, which its
+    copies and slices keep, see get_annotation_store.
+
+    Args:
+        tenant (string): Tenant id to access API.
+        username (string): Username to access API.
+        password (string): Password to access API.
+        snapshot (bool, optional): Flag to reuse the model stored on disk by
+        an earlier call, and to store it otherwise. It is stored per backend,
+        tenant and graph, so changes of the ontology are only picked up once
+        ttl expires or after invalidate_snapshot. Defaults to False.
+        ttl (int, optional): Seconds for which a stored model is reused.
+        Defaults to SNAPSHOT_TTL.
+        compact (bool, optional): Flag to store the text columns as
+        categories, which holds every distinct value only once.
+        Defaults to False.
+        wide (bool, optional): Flag to also merge the annotations onto every
+        row, as one column per kind and language. Defaults to False.
 
-    individuals = response.json()
-    individuals = individuals.get('records')
-    individuals_df = pd.DataFrame(data=individuals)
+    Returns:
+        (DataFrame, optional): The DataFrame holding the model.
+    """
 
-    name = __get_name_from_iri__(iri)
+    client = __get_client__(tenant=tenant, username=username, password=password)
 
-    column_display_names = {
-        'iri': 'IRI',
-        'alternativeTitle': 'ec:alternativeTitle',
-        'contentDescription': 'ec:contentDescription'
-    }
+    return client.load_model(
+        snapshot=snapshot, ttl=ttl, compact=compact, wide=wide)
+
+
+def memory_usage(source_df, show_table=True):
+
+    """It compares the memory used by the model with and without compact mode.
+
+    Args:
+        source_df (DataFrame): The DataFrame holding the model, in either
+        layout.
+        show_table (bool, optional): Flag for displaying the table.
+        Defaults to True.
+
+    Returns:
+        DataFrame: Bytes used per column in either layout, and their ratio.
+    """
+
+    plain_df = source_df.copy()
+    for column in list(plain_df.columns):
+        if isinstance(plain_df[column].dtype, pd.CategoricalDtype):
+            plain_df[column] = plain_df[column].astype(object)
+    compact_df = __compact__(plain_df.copy())
+
+    plain = plain_df.memory_usage(index=False, deep=True)
+    compact = compact_df.memory_usage(index=False, deep=True)
+
+    usage_df = pd.DataFrame(data={'Column': list(plain.index) + ['Total'],
+                                  'Default': list(plain) + [plain.sum()],
+                                  'Compact': list(compact) + [compact.sum()]})
+    usage_df['Ratio'] = (usage_df['Compact'] / usage_df['Default']).round(3)
 
     if show_table:
-        title=f'Individuals of class {name}'
-        show(df=individuals_df,
+        title = 'Memory usage of the model in bytes'
+        show(df=usage_df,
              columnDefs=[ITABLE_COLDEF],
              eval_functions=True,
              tags=ITABLE_TITLE.format(title=title))
 
-    return individuals_df
+    return usage_df
 
 
-def load_model(tenant, username, password):
+def invalidate_snapshot(tenant=None):
 
-    """It acquires the model for the notebook.
+    """It removes models stored on disk by load_model.
 
     Args:
-        tenant (string): Tenant id to access API.
-        username (string): Username to access API.
-        password (string): Password to access API.
+        tenant (string, optional): Tenant id to remove the models of. Removes
+        the models of all tenants if None. Defaults to None.
+    """
 
-    Returns:
-        (DataFrame, optional): The DataFrame holding the model.
+    if not os.path.isdir(SNAPSHOT_DIR):
+        return
+
+    tenant_ = re.sub(r'[^A-Za-z0-9_.-]', '_', tenant) if tenant else None
+
+    for name in os.listdir(SNAPSHOT_DIR):
+        if not name.endswith('.parquet'):
+            continue
+        if tenant_ and name.rsplit('-', 1)[0] != tenant_:
+            continue
+        os.remove(os.path.join(SNAPSHOT_DIR, name))
+
+
+class AnnotationStore:
+
+    """The annotations of the classes, kept apart from the model rows.
+
+    It holds every description, definition and example once, keyed by kind,
+    IRI and language, instead of repeating it on every row of a class. Any
+    language found in the ontology is kept, not only those of LANGUAGES.
+
+    Args:
+        annotations (dict): The annotations keyed by kind, IRI and language,
+        as acquired by OntologyClient.get_annotations.
     """
 
-    def __merge_with_descriptions__(classes):
-
-        descriptions = __get_descriptions__(access_token=access_token)
-
-        for element in classes:
-            iri = element.get('IRI')
-            description = descriptions.get(iri, None)
-            if description:
-                for key, value in description.items():
-                    if key in LANGUAGES:
-                        language_term = LANGUAGE_TERMS.get(key, 'Undefined')
-                        element.update({f'Description ({language_term})': value})
-
-    def __merge_with_definitions__(classes):
-
-        definitions = __get_definitions__(access_token=access_token)
-
-        for element in classes:
-            iri = element.get('IRI')
-            definition = definitions.get(iri, None)
-            if definition:
-                for key, value in definition.items():
-                    if key in LANGUAGES:
-                        language_term = LANGUAGE_TERMS.get(key, 'Undefined')
-                        element.update({f'Definition ({language_term})': value})
-                        
-    def __merge_with_examples__(classes):
-
-        examples = __get_examples__(access_token=access_token)
-
-        for element in classes:
-            iri = element.get('IRI')
-            example = examples.get(iri, None)
-            if example:
-                for key, value in example.items():
-                    if key in LANGUAGES:
-                        language_term = LANGUAGE_TERMS.get(key, 'Undefined')
-                        element.update({f'Example ({language_term})': value})
-
-    access_token = __get_access_token__(
-        tenant=tenant, username=username, password=password)
-
-    if not access_token:
-        return None
+    def __init__(self, annotations):
+
+        self.annotations = {kind: dict(annotations.get(kind) or {})
+                            for kind in ANNOTATIONS}
+
+    def __deepcopy__(self, memo):
+
+        # The store is not changed once built, so the DataFrames deep copying
+        # their attrs share it
+        return self
+
+    @classmethod
+    def from_frame(cls, annotations_df):
+
+        """It builds the store from the table returned by to_frame.
+
+        Args:
+            annotations_df (DataFrame): The table of the annotations.
+
+        Returns:
+            AnnotationStore: The store holding the annotations.
+        """
+
+        annotations = {kind: {} for kind in ANNOTATIONS}
+        columns = zip(annotations_df['IRI'],
+                      annotations_df['Kind'],
+                      annotations_df['Language'],
+                      annotations_df['Value'])
+        for iri, kind, language, value in columns:
+            annotations.setdefault(kind, {}).setdefault(
+                iri, {}).update({language: value})
+
+        return cls(annotations=annotations)
+
+    @classmethod
+    def from_wide(cls, source_df):
+
+        """It builds the store from the annotation columns of a DataFrame.
+
+        Args:
+            source_df (DataFrame): A DataFrame returned by load_model with
+            wide set.
+
+        Returns:
+            AnnotationStore: The store holding the annotations.
+        """
+
+        annotations = {kind: {} for kind in ANNOTATIONS}
+        for kind, term in ANNOTATIONS.items():
+            for language, language_term in LANGUAGE_TERMS.items():
+                column = f'{term} ({language_term})'
+                if column not in source_df.columns:
+                    continue
+                for iri, value in zip(source_df['IRI'], source_df[column]):
+                    if value:
+                        annotations.get(kind).setdefault(
+                            iri, {}).update({language: value})
+
+        return cls(annotations=annotations)
+
+    def get(self, iri, kind, language, default=None):
+
+        """It looks up one annotation.
+
+        Args:
+            iri (string): The IRI of the class.
+            kind (string): The kind of the annotation, a key of ANNOTATIONS.
+            language (string): The language of the annotation.
+            default (optional): The value if there is no such annotation.
+            Defaults to None.
+
+        Returns:
+            (string, optional): The annotation.
+        """
+
+        return self.annotations.get(kind, {}).get(iri, {}).get(
+            language, default)
+
+    def get_kind(self, kind):
+
+        """It acquires all annotations of one kind.
+
+        Args:
+            kind (string): The kind of the annotations, a key of ANNOTATIONS.
+
+        Returns:
+            dict: The annotations keyed by IRI and language.
+        """
+
+        return self.annotations.get(kind, {})
+
+    def to_frame(self):
+
+        """It lists the annotations as a table.
+
+        Returns:
+            DataFrame: One row per IRI, kind and language.
+        """
+
+        rows = ((iri, kind, language, value)
+                for kind, annotations in self.annotations.items()
+                for iri, values in annotations.items()
+                for language, value in values.items())
+
+        return pd.DataFrame(data=list(rows),
+                            columns=['IRI', 'Kind', 'Language', 'Value'])
+
+    def merge(self, source_df, languages=None):
+
+        """It merges the annotations onto the rows of the model.
+
+        Args:
+            source_df (DataFrame): Primary DataFrame to merge onto.
+            languages (list, optional): Languages to merge. Merges those of
+            LANGUAGES if None. Defaults to None.
 
-    classes = __get_all_classes__(access_token=access_token)
+        Returns:
+            DataFrame: A copy of the DataFrame with one column per kind and
+            language, named as in LANGUAGE_TERMS and ANNOTATIONS.
+        """
 
-    __merge_with_descriptions__(classes)
-    __merge_with_definitions__(classes)
-    __merge_with_examples__(classes)
+        languages = LANGUAGES if languages is None else languages
 
+        annotations_df = self.to_frame()
+        annotations_df = annotations_df[
+            annotations_df['Language'].isin(languages) &
+            annotations_df['Value'].notna() & (annotations_df['Value'] != '')]
 
-    
-    classes_df = pd.DataFrame(classes)
-    classes_df = __remove_nans__(classes_df)
+        if annotations_df.empty:
+            return source_df.copy()
+
+        # One column per kind and language, in the order of the old layout
+        terms = annotations_df['Kind'].map(ANNOTATIONS)
+        language_terms = annotations_df['Language'].map(
+            LANGUAGE_TERMS).fillna('Undefined')
+        annotations_df = annotations_df.assign(
+            Column=terms + ' (' + language_terms + ')')
+        columns = [f'{term} ({LANGUAGE_TERMS.get(language, "Undefined")})'
+                   for term in ANNOTATIONS.values()
+                   for language in languages]
+
+        wide_df = annotations_df.pivot(
+            index='IRI', columns='Column', values='Value')
+        wide_df = wide_df[[column for column in columns
+                           if column in wide_df.columns]]
+
+        merged_df = source_df.join(wide_df, on='IRI')
+        merged_df[list(wide_df.columns)] = \
+            merged_df[list(wide_df.columns)].fillna('')
+
+        return merged_df
+
+
+# Key of the AnnotationStore in the attrs of a DataFrame
+__annotation_store_key__ = 'annotation_store'
+
+
+def __register_annotation_store__(source_df, store):
+
+    # Kept in the attrs, which pandas passes on to copies and slices
+    source_df.attrs[__annotation_store_key__] = store
+
+
+def get_annotation_store(source_df):
+
+    """It acquires the AnnotationStore of the given DataFrame.
+
+    Args:
+        source_df (DataFrame): Primary DataFrame to query from.
+
+    Returns:
+        (AnnotationStore, optional): The store attached by load_model, or
+        one built from the annotation columns if the DataFrame has any.
+    """
+
+    store = source_df.attrs.get(__annotation_store_key__)
+
+    if store is not None:
+        return store
+
+    columns = [f'{term} ({language_term})'
+               for term in ANNOTATIONS.values()
+               for language_term in LANGUAGE_TERMS.values()]
+    if not source_df.columns.isin(columns).any():
+        return None
+
+    store = AnnotationStore.from_wide(source_df)
+    __register_annotation_store__(source_df=source_df, store=store)
+
+    return store
+
+
+def merge_annotations(source_df, languages=None):
+
+    """It merges the annotations onto every row of the model.
+
+    Args:
+        source_df (DataFrame): Primary DataFrame to merge onto.
+        languages (list, optional): Languages to merge. Merges those of
+        LANGUAGES if None. Defaults to None.
+
+    Returns:
+        DataFrame: A copy of the DataFrame with one column per annotation kind
+        and language, such as 'Description (English)'.
+    """
+
+    store = get_annotation_store(source_df=source_df)
+
+    if store is None:
+        return source_df.copy()
+
+    return store.merge(source_df=source_df, languages=languages)
+
+
+class TooltipLayout:
+
+    """Word-wraps and truncates the text of graph node tooltips.
+
+    Lines are broken at the last whitespace before `width` characters, and
+    text beyond `max_length` characters is cut off with an ellipsis. The text
+    is handled a line at a time rather than a character at a time, and laid
+    out texts are memoized per IRI, language and verbosity.
+
+    Args:
+        width (int, optional): Characters per line.
+        Defaults to TOOLTIP_TEXT_WIDTH.
+        max_length (int, optional): Characters of the text shown at most.
+        Defaults to TOOLTIP_TEXT_MAX_LENGTH.
+        maxsize (int, optional): Maximum number of memoized tooltips.
+        Defaults to TOOLTIP_CACHE_SIZE.
+    """
+
+    def __init__(self,
+                 width=TOOLTIP_TEXT_WIDTH,
+                 max_length=TOOLTIP_TEXT_MAX_LENGTH,
+                 maxsize=TOOLTIP_CACHE_SIZE):
+
+        self.width = width
+        self.max_length = max_length
+
+        self._cache = TTLCache(maxsize=maxsize, ttl=float('inf'))
+
+    def layout(self, text):
+
+        """It word-wraps and truncates a text.
+
+        Args:
+            text (string): The text to lay out.
+
+        Returns:
+            string: The text with line breaks, ending in one.
+        """
+
+        if not text:
+            return ''
+
+        width = self.width
+        lines = []
+        start = 0
+        added_linebreaks = 0
+
+        while True:
+            # The character at `limit` is the first one past the maximum
+            # length, which grows with every line break added
+            limit = self.max_length + added_linebreaks
+            newline = text.find('\n', start)
+            newline = len(text) if newline < 0 else newline
+            overflow = start + width
+
+            if limit < len(text) and limit <= min(newline, overflow):
+                lines.append(text[start:limit])
+                laid_out = ''.join(lines)
+                return laid_out[:limit - 1] + '…' + '\n'
+
+            if newline <= overflow and newline < len(text):
+                lines.append(text[start:newline + 1])
+                start = newline + 1
+            elif overflow < newline:
+                linebreak = width - 1
+                for index in range(width - 1, 0, -1):
+                    if text[start + index].isspace():
+                        linebreak = index
+                        break
+                lines.append(text[start:start + linebreak + 1] + '\n')
+                added_linebreaks += 1
+                start += linebreak + 1
+            else:
+                lines.append(text[start:] + '\n')
+                return ''.join(lines)
+
+    def get(self, iri, language, text, verbose=False, properties=''):
+
+        """It lays out the tooltip of a node, reusing an earlier layout.
+
+        Args:
+            iri (string): The IRI of the node.
+            language (str): Language of the text.
+            text (string): The description to lay out.
+            verbose (bool, optional): Flag for tooltips which list
+            properties. Defaults to False.
+            properties (string, optional): Text appended to the laid out
+            description. Defaults to ''.
+
+        Returns:
+            string: The tooltip.
+        """
+
+        key = (iri, language, verbose)
+        entry = self._cache.get(key)
+
+        # The texts are compared, so a changed model is laid out again
+        if entry is not None and entry[0] == (text, properties):
+            return entry[1]
+
+        tooltip = self.layout(text) + properties
+        self._cache.set(key, ((text, properties), tooltip))
+
+        return tooltip
+
+
+# Tooltips of graph nodes shared by all graphs
+__tooltips__ = TooltipLayout()
+
+
+class ClassIndex:
+
+    """An index over the DataFrame returned by load_model.
+
+    It groups the rows by language and maps IRIs to their row positions in
+    the DataFrame, so that queries select the current values from the
+    DataFrame they are given. It also holds the subclass relation as
+    adjacency lists, so that queries look up rows directly instead of
+    scanning the whole DataFrame. Row lists named `hierarchy` only
+    hold rows whose superclass is in the same language or absent.
+
+    Args:
+        source_df (DataFrame): Primary DataFrame to index.
+    """
+
+    def __init__(self, source_df):
+
+        self.length = len(source_df)
+        # Sorting, filtering or adding rows in place gives the DataFrame a
+        # new index, which tells that the row positions went stale
+        self.source_index = source_df.index
+
+        self.language_rows = {}
+        self.rows = {}
+        self.hierarchy_rows = {}
+        self.subclass_rows = {}
+        self.class_rows = {}
+        self.subclasses = {}
+        self.superclasses = {}
+
+        columns = zip(source_df['IRI'],
+                      source_df['Language'],
+                      source_df['Superclass IRI'],
+                      source_df['Superclass language'])
+
+        for row, (iri, language, superclass_iri, superclass_language) \
+                in enumerate(columns):
+            self.language_rows.setdefault(language, []).append(row)
+
+            self.rows.setdefault((language, iri), []).append(row)
+            self.class_rows.setdefault(language, {}).setdefault(iri, row)
+
+            if superclass_language in (language, ''):
+                self.hierarchy_rows.setdefault(
+                    (language, iri), []).append(row)
+                if superclass_iri:
+                    self.subclass_rows.setdefault(
+                        (language, superclass_iri), []).append(row)
+
+            if superclass_iri:
+                self.subclasses.setdefault(superclass_iri, {})[iri] = None
+                self.superclasses.setdefault(iri, {})[superclass_iri] = None
+
+        self._ancestors = None
+        self._descendants = None
+
+    def matches(self, source_df):
+
+        """It checks whether the index still describes the given DataFrame.
+
+        Args:
+            source_df (DataFrame): The DataFrame this index was built from.
+
+        Returns:
+            bool: False if rows were added, removed or reordered in place
+            since. Values changed in place keep the index valid, as they are
+            read from the DataFrame on every query.
+        """
+
+        # An equal index is not enough, as sorting with ignore_index gives
+        # an equal one over reordered rows
+        return len(source_df) == self.length and \
+            source_df.index is self.source_index
+
+    def get_partition(self, source_df, language):
+
+        """It selects the rows of one language, with the index.
+
+        Args:
+            source_df (DataFrame): The DataFrame this index was built from.
+            language (str): Language of the rows.
+
+        Returns:
+            DataFrame: The rows of the language, as they are at the time of
+            the call.
+        """
+
+        return source_df.iloc[self.language_rows.get(language, [])]
+
+    def __build_closure__(self):
+
+        # Walking up breadth-first from every class records the shortest
+        # distance to each ancestor, and terminates on cyclic hierarchies
+        ancestors = {}
+        for iri in set(self.superclasses) | set(self.subclasses):
+            distances = {}
+            frontier = [iri]
+            distance = 0
+            while frontier:
+                distance += 1
+                next_frontier = []
+                for node in frontier:
+                    for superclass_iri in self.superclasses.get(node, {}):
+                        if superclass_iri not in distances and \
+                                superclass_iri != iri:
+                            distances[superclass_iri] = distance
+                            next_frontier.append(superclass_iri)
+                frontier = next_frontier
+            ancestors[iri] = distances
+
+        descendants = {}
+        for iri, distances in ancestors.items():
+            for ancestor, distance in distances.items():
+                descendants.setdefault(ancestor, {})[iri] = distance
+
+        self._ancestors = ancestors
+        self._descendants = descendants
+
+    def get_rows(self, iri, language, hierarchy=False):
+
+        """It looks up the row positions of a class.
+
+        Args:
+            iri (string): The IRI of the class.
+            language (str): Language of the rows.
+            hierarchy (bool, optional): Flag to only include rows whose
+            superclass is in the same language or absent. Defaults to False.
+
+        Returns:
+            list: The row positions in the DataFrame.
+        """
+
+        rows = self.hierarchy_rows if hierarchy else self.rows
+
+        return rows.get((language, iri), [])
+
+    def get_subclass_rows(self, iri, language):
+
+        """It looks up the row positions of the direct subclasses of a class.
+
+        Args:
+            iri (string): The IRI of the superclass.
+            language (str): Language of the rows.
+
+        Returns:
+            list: The row positions in the DataFrame.
+        """
+
+        return self.subclass_rows.get((language, iri), [])
+
+    def get_class_rows(self, language):
+
+        """It looks up the first row position of every class in a language.
+
+        Args:
+            language (str): Language of the rows.
+
+        Returns:
+            list: The row positions in the DataFrame.
+        """
+
+        return list(self.class_rows.get(language, {}).values())
+
+    def get_subclasses(self, iri):
+
+        """It looks up the IRIs of the direct subclasses of a class.
+
+        Args:
+            iri (string): The IRI of the superclass.
+
+        Returns:
+            list: The IRIs of the subclasses.
+        """
+
+        return list(self.subclasses.get(iri, {}))
+
+    def get_superclasses(self, iri):
+
+        """It looks up the IRIs of the direct superclasses of a class.
+
+        Args:
+            iri (string): The IRI of the subclass.
+
+        Returns:
+            list: The IRIs of the superclasses.
+        """
+
+        return list(self.superclasses.get(iri, {}))
+
+    def get_ancestors(self, iri, depth=None):
+
+        """It looks up all transitive superclasses of a class.
+
+        Args:
+            iri (string): The IRI of the class.
+            depth (int, optional): Maximum number of levels to go up.
+            Unlimited if None. Defaults to None.
+
+        Returns:
+            dict: The distances of the superclasses keyed by IRI, nearest
+            first.
+        """
+
+        if self._ancestors is None:
+            self.__build_closure__()
+
+        return __limit_distances__(self._ancestors.get(iri, {}), depth)
+
+    def get_descendants(self, iri, depth=None):
+
+        """It looks up all transitive subclasses of a class.
+
+        Args:
+            iri (string): The IRI of the class.
+            depth (int, optional): Maximum number of levels to go down.
+            Unlimited if None. Defaults to None.
+
+        Returns:
+            dict: The distances of the subclasses keyed by IRI, nearest first.
+        """
+
+        if self._descendants is None:
+            self.__build_closure__()
+
+        return __limit_distances__(self._descendants.get(iri, {}), depth)
+
+    def is_subclass_of(self, iri, superclass_iri):
+
+        """It checks whether a class is a transitive subclass of another one.
+
+        Args:
+            iri (string): The IRI of the class.
+            superclass_iri (string): The IRI of the presumed superclass.
+
+        Returns:
+            bool: True if both IRIs are the same or the class is below the
+            superclass in the hierarchy.
+        """
+
+        if iri == superclass_iri:
+            return True
+
+        if self._ancestors is None:
+            self.__build_closure__()
+
+        return superclass_iri in self._ancestors.get(iri, {})
+
+
+def __limit_distances__(distances, depth):
+
+    distances = sorted(distances.items(), key=lambda item: item[1])
+
+    return {iri: distance for iri, distance in distances
+            if depth is None or distance <= depth}
+
+
+# Indexes of the models in use, keyed by the id of their DataFrame
+__class_indexes__ = {}
+
+
+def get_class_index(source_df):
+
+    """It acquires the ClassIndex of the given DataFrame, building it once.
+
+    Args:
+        source_df (DataFrame): Primary DataFrame to query from.
+
+    Returns:
+        ClassIndex: The index of the DataFrame.
+    """
+
+    key = id(source_df)
+    reference, index = __class_indexes__.get(key, (None, None))
+
+    # Rebuilding if the id was reused or rows were moved in place
+    if reference is None or reference() is not source_df or \
+            not index.matches(source_df=source_df):
+        index = ClassIndex(source_df)
+        if reference is None or reference() is not source_df:
+            weakref.finalize(source_df, __class_indexes__.pop, key, None)
+        __class_indexes__.update({key: (weakref.ref(source_df), index)})
+
+    return index
+
+
+def get_language_partition(source_df, language='en'):
+
+    """It acquires the rows of the given DataFrame in one language.
+
+    The rows are selected with the ClassIndex of the DataFrame on every
+    call, so that they hold its current values.
+
+    Args:
+        source_df (DataFrame): Primary DataFrame to query from.
+        language (str, optional): Language of the rows. Defaults to 'en'.
+
+    Returns:
+        DataFrame: The rows of the language.
+    """
+
+    index = get_class_index(source_df=source_df)
+
+    return index.get_partition(source_df=source_df, language=language)
+
+
+def __get_related_classes__(source_df, index, distances, language):
+
+    class_rows = index.class_rows.get(language, {})
+    iris = [iri for iri in distances if iri in class_rows]
+
+    resultant_df = source_df.iloc[[class_rows.get(iri) for iri in iris]]
+    resultant_df = resultant_df[resultant_df.columns[resultant_df.columns.isin(
+        ['Label', 'IsLeafClass', 'IRI'])]]
+    resultant_df = resultant_df.assign(
+        Distance=[distances.get(iri) for iri in iris])
+    resultant_df.reset_index(drop=True, inplace=True)
+
+    return resultant_df
+
+
+def get_all_classes(source_df, language='en', show_table=True):
+
+    """It extracts a unique DataFrame of classes from the given DataFrame.
+
+    Args:
+        source_df (DataFrame): Primary DataFrame to query from.
+        language (str, optional): Language to query for. Could accept either
+        of these: 'en', 'de', and 'fr'.
+        Defaults to 'en'.
+        show_table (bool, optional): Flag for displaying the table.
+        Defaults to True.
+
+    Returns:
+        DataFrame: The DataFrame holding all the classes.
+    """
+
+    index = get_class_index(source_df=source_df)
+
+    resultant_df = source_df.iloc[index.get_class_rows(language=language)]
+    resultant_df = resultant_df[resultant_df.columns[resultant_df.columns.isin(
+        ['Label', 'IsLeafClass', 'IRI'])]]
+    resultant_df.reset_index(drop=True, inplace=True)
+
+    if show_table:
+        title='List of classes'
+        show(df=resultant_df,
+             columnDefs=[ITABLE_COLDEF],
+             eval_functions=True,
+             tags=ITABLE_TITLE.format(title=title))
+
+    return resultant_df
+
+
+def get_hierarchy(source_df,
+                  iris,
+                  show_superclasses=True,
+                  show_subclasses=True,
+                  language='en',
+                  show_table=True):
+
+    """It extracts classes based on give IRIs along with the relations.
+
+    Args:
+        source_df (DataFrame): Primary DataFrame to query from.
+        iris (list): List of IRIs to query.
+        show_superclasses (bool, optional): Flag to extract superclasses.
+        Defaults to True.
+        show_subclasses (bool, optional): Flag to extract subclasses.
+        Defaults to True.
+        language (str, optional): Language to query for. Could accept either
+        of these: 'en', 'de', and 'fr'.
+        Defaults to 'en'.
+        show_table (bool, optional): Flag to display the table.
+        Defaults to True.
+
+    Returns:
+        DataFrame: The DataFrame holding the queried IRIs.
+    """
+
+    iris = list(set(iris))
+
+    __validate_args__(arg=iris, flat=False)
+
+    index = get_class_index(source_df=source_df)
+
+    # Collecting the IRIs of every direction first, so that all rows are
+    # selected at once
+    superclass_iris = []
+    if show_superclasses:
+        superclass_iris = [superclass_iri for iri in iris
+                           for superclass_iri in index.get_superclasses(iri)]
+
+    rows = [row for iri in iris + superclass_iris
+            for row in index.get_rows(
+                iri=iri, language=language, hierarchy=True)]
+    if show_subclasses:
+        rows += [row for iri in iris
+                 for row in index.get_subclass_rows(
+                     iri=iri, language=language)]
+
+    resultant_df = source_df.iloc[list(dict.fromkeys(rows))]
+
+    resultant_df = resultant_df.sort_values(by=['Label'])
+    resultant_df.drop_duplicates(
+        subset=['IRI', 'Superclass IRI'], inplace=True)
+    #resultant_df.drop(['Description (English)',
+    #                   'Description (German)',
+    #                   'Description (French)',
+    #                   'Language',
+    #                   'Superclass language'],
+     #                 axis=1,
+     #                 inplace=True)
+    resultant_df.reset_index(drop=True, inplace=True)
+
+    if show_table:
+        names = __get_names_from_iris__(iris=iris)
+
+        if len(names) > 1:
+            title = 'Class hierarchies of '
+        else:
+            title = 'Class hierarchy of '
+        title += ', '.join(names)
+
+        show(df=resultant_df,
+             columnDefs=[ITABLE_COLDEF],
+             eval_functions=True,
+             tags=ITABLE_TITLE.format(title=title))
 
-    return classes_df
+    return resultant_df
 
 
-def get_all_classes(source_df, language='en', show_table=True):
+def get_ancestors(source_df, iri, depth=None, language='en', show_table=True):
 
-    """It extracts a unique DataFrame of classes from the given DataFrame.
+    """It extracts all transitive superclasses of the given IRI.
 
     Args:
         source_df (DataFrame): Primary DataFrame to query from.
+        iri (string): The IRI to query superclasses for.
+        depth (int, optional): Maximum number of levels to go up. Unlimited
+        if None. Defaults to None.
         language (str, optional): Language to query for. Could accept either
         of these: 'en', 'de', and 'fr'.
         Defaults to 'en'.
-        show_table (bool, optional): Flag for displaying the table.
+        show_table (bool, optional): Flag to display the table.
         Defaults to True.
 
     Returns:
-        DataFrame: The DataFrame holding all the classes.
+        DataFrame: The DataFrame holding the superclasses, nearest first.
     """
 
-    resultant_df = source_df.copy()
-    resultant_df = resultant_df[resultant_df['Language'] == language]
-    resultant_df.drop_duplicates(subset='IRI', inplace=True)
-    resultant_df = resultant_df[resultant_df.columns[resultant_df.columns.isin(
-        ['Label', 'IsLeafClass', 'IRI'])]]
-    resultant_df.reset_index(drop=True, inplace=True)
+    __validate_args__(arg=iri, flat=True)
+
+    index = get_class_index(source_df=source_df)
+    ancestors = index.get_ancestors(iri=iri, depth=depth)
+
+    resultant_df = __get_related_classes__(source_df=source_df,
+                                           index=index,
+                                           distances=ancestors,
+                                           language=language)
 
     if show_table:
-        title='List of classes'
+        title = f'Superclasses of {__get_name_from_iri__(iri)}'
+
         show(df=resultant_df,
              columnDefs=[ITABLE_COLDEF],
              eval_functions=True,
@@ -461,22 +2633,19 @@ def get_all_classes(source_df, language='en', show_table=True):
     return resultant_df
 
 
-def get_hierarchy(source_df,
-                  iris,
-                  show_superclasses=True,
-                  show_subclasses=True,
-                  language='en',
-                  show_table=True):
+def get_descendants(source_df,
+                    iri,
+                    depth=None,
+                    language='en',
+                    show_table=True):
 
-    """It extracts classes based on give IRIs along with the relations.
+    """It extracts all transitive subclasses of the given IRI.
 
     Args:
         source_df (DataFrame): Primary DataFrame to query from.
-        iris (list): List of IRIs to query.
-        show_superclasses (bool, optional): Flag to extract superclasses.
-        Defaults to True.
-        show_subclasses (bool, optional): Flag to extract subclasses.
-        Defaults to True.
+        iri (string): The IRI to query subclasses for.
+        depth (int, optional): Maximum number of levels to go down. Unlimited
+        if None. Defaults to None.
         language (str, optional): Language to query for. Could accept either
         of these: 'en', 'de', and 'fr'.
         Defaults to 'en'.
@@ -484,54 +2653,21 @@ def get_hierarchy(source_df,
         Defaults to True.
 
     Returns:
-        DataFrame: The DataFrame holding the queried IRIs.
+        DataFrame: The DataFrame holding the subclasses, nearest first.
     """
 
-    iris = list(set(iris))
-
-    __validate_args__(arg=iris, flat=False)
-
-    extracted_df = source_df.copy()
-    extracted_df = extracted_df[(extracted_df['Language'] == language) &
-                                (extracted_df['Superclass language'].isin(
-                                    [language, '']))]
-    resultant_df = pd.DataFrame()
-
-    for iri in iris:
-
-        class_df = extracted_df.copy()[extracted_df['IRI'] == iri]
-        resultant_df = pd.concat([resultant_df, class_df])
+    __validate_args__(arg=iri, flat=True)
 
-        if show_subclasses:
-            subclasses_df = extracted_df.copy(
-            )[extracted_df['Superclass IRI'] == iri]
-            resultant_df = pd.concat([resultant_df, subclasses_df])
-        if show_superclasses:
-            for _, row in resultant_df['Superclass IRI'].iteritems():
-                superclass_df = extracted_df.copy(
-                )[extracted_df['IRI'] == row]
-                resultant_df = pd.concat([resultant_df, superclass_df])
+    index = get_class_index(source_df=source_df)
+    descendants = index.get_descendants(iri=iri, depth=depth)
 
-    resultant_df.sort_values(by=['Label'], inplace=True)
-    resultant_df.drop_duplicates(
-        subset=['IRI', 'Superclass IRI'], inplace=True)
-    #resultant_df.drop(['Description (English)',
-    #                   'Description (German)',
-    #                   'Description (French)',
-    #                   'Language',
-    #                   'Superclass language'],
-     #                 axis=1,
-     #                 inplace=True)
-    resultant_df.reset_index(drop=True, inplace=True)
+    resultant_df = __get_related_classes__(source_df=source_df,
+                                           index=index,
+                                           distances=descendants,
+                                           language=language)
 
     if show_table:
-        names = __get_names_from_iris__(iris=iris)
-
-        if len(names) > 1:
-            title = 'Class hierarchies of '
-        else:
-            title = 'Class hierarchy of '
-        title += ', '.join(names)
+        title = f'Subclasses of {__get_name_from_iri__(iri)}'
 
         show(df=resultant_df,
              columnDefs=[ITABLE_COLDEF],
@@ -541,6 +2677,25 @@ def get_hierarchy(source_df,
     return resultant_df
 
 
+def is_subclass_of(source_df, iri, superclass_iri):
+
+    """It checks whether a class is a transitive subclass of another one.
+
+    Args:
+        source_df (DataFrame): Primary DataFrame to query from.
+        iri (string): The IRI of the class.
+        superclass_iri (string): The IRI of the presumed superclass.
+
+    Returns:
+        bool: True if both IRIs are the same or the class is below the
+        superclass in the hierarchy.
+    """
+
+    index = get_class_index(source_df=source_df)
+
+    return index.is_subclass_of(iri=iri, superclass_iri=superclass_iri)
+
+
 def get_properties(tenant,
                    username,
                    password,
@@ -564,78 +2719,35 @@ def get_properties(tenant,
         DataFrame: The DataFrame holding the properties.
     """
 
-    __validate_args__(arg=iri, flat=True)
-
-    access_token = __get_access_token__(
-        tenant=tenant, username=username, password=password)
-
-    url = f'{BASE_URL}{ENAPSO_NAMESPACE}/v1/get-class-own-properties'
-
-    headers = {
-        'Content-Type': 'application/json',
-        'x-enapso-auth': access_token
-    }
+    client = __get_client__(tenant=tenant, username=username, password=password)
 
-    try:
-        body = {'cls': iri}
-        response = requests.post(
-            url=url, headers=headers, json=body, timeout=REQUEST_TIMEOUT)
-        response.raise_for_status()
-    except requests.exceptions.RequestException as exception:
-        return False
+    return client.get_properties(iri=iri, show_table=show_table, raw=raw)
 
-    properties = response.json()
-    properties = properties.get('records')
 
-    if raw:
-        return properties
+def invalidate_properties(tenant=None, iri=None):
 
-    for property in properties:
-        for key, value in property.items():
-            if key in ['prop', 'type', 'range', 'some']:
-                prefix = value.split('#')[0]+'#'
-                if prefix in PREFIXES:
-                    compacted_value = PREFIXES.get(prefix)+f":{value.split('#')[1]}"
-                    property.update({key: compacted_value})
-
-    properties = pd.DataFrame(data=properties)
-
-    column_display_names = {
-        'prop': 'Property',
-        'type': 'Type',
-        'range': 'Range',
-        'max': 'owl:maxCardinality',
-        'some': 'owl:someValuesFrom'
-    }
+    """It removes properties from the cache shared by the clients.
 
-    columns = list(properties.columns)
-    included_columns = ['prop', 'type', 'range']
+    Args:
+        tenant (string, optional): Tenant id to remove the properties of.
+        Removes the properties of all tenants if None. Defaults to None.
+        iri (string, optional): The IRI to remove the properties of. Removes
+        the properties of all IRIs if None. Defaults to None.
+    """
 
-    if 'max' in columns:
-        included_columns.append('max')
-        properties['max'] = properties['max'].fillna('')
-    if 'some' in columns:
-        included_columns.append('some')
-        properties['some'] = properties['some'].fillna('')
+    __properties_cache__.invalidate(
+        lambda key: tenant in (None, key[0]) and iri in (None, key[1]))
 
-    included_column_display_names = {col: column_display_names.get(
-        col) for col in included_columns}
-    properties = properties[properties.columns[properties.columns.isin(
-        included_columns)]]
-    properties.rename(columns=included_column_display_names, inplace=True)
-    properties.reset_index(drop=True, inplace=True)
-    name = __get_name_from_iri__(iri)
 
-    if show_table:
-        title=f'Properties of class {name}'
+def get_properties_cache_stats():
 
-        show(df=properties,
-             columnDefs=[ITABLE_COLDEF],
-             eval_functions=True,
-             tags=ITABLE_TITLE.format(title=title))
+    """It reports the usage of the properties cache shared by the clients.
 
-    return properties
+    Returns:
+        dict: Hits, misses, evictions and size of the cache.
+    """
 
+    return __properties_cache__.stats
 
 
 def get_description(source_df, iris, language='en', show_table=True):
@@ -659,24 +2771,24 @@ def get_description(source_df, iris, language='en', show_table=True):
 
     __validate_args__(arg=iris, flat=False)
 
-    extracted_df = source_df.copy()
-    extracted_df = extracted_df[extracted_df['Language'] == language]
-    resultant_df = pd.DataFrame()
+    index = get_class_index(source_df=source_df)
+    rows = [index.get_rows(iri=iri, language=language) for iri in iris]
+    rows = [rows_[0] for rows_ in rows if rows_]
 
-    for iri in iris:
-        description_df = extracted_df.copy()[extracted_df['IRI'] == iri]
-        resultant_df = pd.concat([resultant_df, description_df])
+    resultant_df = source_df.iloc[rows][['Label']]
+    resultant_df.reset_index(drop=True, inplace=True)
 
-    language_term = LANGUAGE_TERMS.get(language, 'Undefined')
+    store = get_annotation_store(source_df=source_df)
+    if store is None:
+        raise ValueError('DataFrame holds no annotations, use one returned ' +
+                         'by load_model or merge_annotations.')
 
-    resultant_df.drop_duplicates(subset='IRI', inplace=True)
-    
-    resultant_df = resultant_df[resultant_df.columns[resultant_df.columns.isin(
-        ['Label', f'Description ({language_term})', f'Definition ({language_term})', f'Example ({language_term})'])]]
+    language_term = LANGUAGE_TERMS.get(language, 'Undefined')
+    class_iris = list(source_df['IRI'].iloc[rows])
 
-    
- 
-    resultant_df.reset_index(drop=True, inplace=True)
+    for kind, term in ANNOTATIONS.items():
+        values = [store.get(iri, kind, language, '') for iri in class_iris]
+        resultant_df[f'{term} ({language_term})'] = values
 
     if show_table:
         names = __get_names_from_iris__(iris=iris)
@@ -705,7 +2817,10 @@ def get_hierarchy_graph(tenant,
                         show_superclasses,
                         show_subclasses,
                         language='en',
-                        verbose_tooltips=True):
+                        verbose_tooltips=True,
+                        max_nodes=None,
+                        max_siblings=None,
+                        layout=None):
 
     """It generates a Network object of the class hierarchy for the given
     list of IRIs.
@@ -726,21 +2841,31 @@ def get_hierarchy_graph(tenant,
         Defaults to 'en'.
         verbose_tooltips (bool, optional): Flag to display extended tooltip.
         Defaults to True.
+        max_nodes (int, optional): Budget of class nodes. Surplus subclasses
+        of the queried classes are collapsed into one node per superclass.
+        Defaults to None.
+        max_siblings (int, optional): Subclasses shown per queried class
+        before the rest are collapsed into one node. Defaults to None.
+        layout (str, optional): Layout computed before rendering, with physics
+        disabled. Could accept either of these: 'hierarchical', 'radial',
+        'circular', 'shell', 'spring' and 'kamada_kawai'. Physics lays out
+        the graph if None. Defaults to None.
 
     Returns:
         Network: The Network object loaded with nodes and edges to display.
     """
 
-    graph = __get_network_graph__(tenant,
-                                  username,
-                                  password,
-                                  source_df,
-                                  iris,
-                                  show_superclasses=show_superclasses,
-                                  show_subclasses=show_subclasses,
-                                  show_properties=False,
-                                  language=language,
-                                  verbose_tooltips=verbose_tooltips)
+    client = __get_client__(tenant=tenant, username=username, password=password)
+
+    graph = client.get_hierarchy_graph(source_df=source_df,
+                                       iris=iris,
+                                       show_superclasses=show_superclasses,
+                                       show_subclasses=show_subclasses,
+                                       language=language,
+                                       verbose_tooltips=verbose_tooltips,
+                                       max_nodes=max_nodes,
+                                       max_siblings=max_siblings,
+                                       layout=layout)
     return graph
 
 
@@ -752,7 +2877,12 @@ def get_properties_graph(tenant,
                          show_superclasses=False,
                          show_subclasses=False,
                          language='en',
-                         verbose_tooltips=False):
+                         verbose_tooltips=False,
+                         merge_datatypes=False,
+                         max_nodes=None,
+                         max_siblings=None,
+                         aggregate_datatypes=False,
+                         layout=None):
 
     """It generates a Network object of the class properties for the given
     list of IRIs.
@@ -773,75 +2903,207 @@ def get_properties_graph(tenant,
         Defaults to 'en'.
         verbose_tooltips (bool, optional): Flag to display extended tooltip.
         Defaults to True.
+        merge_datatypes (bool, optional): Flag to show a datatype property
+        shared by several classes as one node. Defaults to False.
+        max_nodes (int, optional): Budget of class nodes. Surplus subclasses
+        of the queried classes are collapsed into one node per superclass.
+        Defaults to None.
+        max_siblings (int, optional): Subclasses shown per queried class
+        before the rest are collapsed into one node. Defaults to None.
+        aggregate_datatypes (bool, optional): Flag to show the datatype
+        properties of a class as one node. Also set if the properties would
+        exceed max_nodes. Defaults to False.
+        layout (str, optional): Layout computed before rendering, with physics
+        disabled. Could accept either of these: 'hierarchical', 'radial',
+        'circular', 'shell', 'spring' and 'kamada_kawai'. Physics lays out
+        the graph if None. Defaults to None.
 
     Returns:
         Network: The Network object loaded with nodes and edges to display.
     """
 
-    graph = __get_network_graph__(tenant=tenant,
-                                  username=username,
-                                  password=password,
-                                  source_df=source_df,
-                                  iris=iris,
-                                  show_superclasses=show_superclasses,
-                                  show_subclasses=show_subclasses,
-                                  show_properties=True,
-                                  language=language,
-                                  verbose_tooltips=verbose_tooltips)
+    client = __get_client__(tenant=tenant, username=username, password=password)
+
+    graph = client.get_properties_graph(source_df=source_df,
+                                        iris=iris,
+                                        show_superclasses=show_superclasses,
+                                        show_subclasses=show_subclasses,
+                                        language=language,
+                                        verbose_tooltips=verbose_tooltips,
+                                        merge_datatypes=merge_datatypes,
+                                        max_nodes=max_nodes,
+                                        max_siblings=max_siblings,
+                                        aggregate_datatypes=aggregate_datatypes,
+                                        layout=layout)
     return graph
 
 
-def __get_network_graph__(tenant,
-                          username,
-                          password,
-                          source_df,
-                          iris,
-                          show_superclasses=True,
-                          show_subclasses=True,
-                          show_properties=False,
-                          language='en',
-                          verbose_tooltips=False):
+def __get_graph_title__(iris, show_properties):
 
-    iris = list(set(iris))
+    names = __get_names_from_iris__(iris=iris)
 
-    __validate_args__(arg=iris, flat=False)
+    if show_properties:
+        if len(names) > 1:
+            title = 'Figure: Properties of classes '
+        else:
+            title = 'Figure: Properties of class '
+    else:
+        title = 'Figure: Class hierarchy of '
+
+    title += ', '.join(names)
+
+    return title
+
+
+def __get_datatype_node_id__(iri, property_iri):
+
+    # Spaces cannot occur in IRIs, which keeps the ids unambiguous
+    return f'{property_iri} {iri}'
 
-    def tooltip_description(description):
-
-        description_ = ''
-        if description:
-            line = ''
-            count = 0
-            added_linebreaks = 0
-            for index, char in enumerate(description):
-                count += 1
-                if count > TOOLTIP_TEXT_MAX_LENGTH + added_linebreaks:
-                    description_ += line
-                    line = ''
-                    description_ = description_[:TOOLTIP_TEXT_MAX_LENGTH+added_linebreaks-1] + '…'
-                    break
-
-                line += char
-                if (char == '\n'):
-                    description_ += line
-                    line = ''
-                elif len(line) > TOOLTIP_TEXT_WIDTH:
-                    linebreak_index = TOOLTIP_TEXT_WIDTH-1
-                    for index in range(TOOLTIP_TEXT_WIDTH-1, 0, -1):
-                        if line[index].isspace():
-                            linebreak_index = index
-                            break
-                    description_ += line[:linebreak_index+1]+'\n'
-                    added_linebreaks += 1
-                    line = line[linebreak_index+1:]
-            description_ += line + '\n'
-            line = ''
-
-        return description_
 
+def __collapse_siblings__(resultant_df,
+                          iris,
+                          max_nodes,
+                          max_siblings,
+                          shown=()):
+
+    # Only the subclasses of the queried classes are collapsed, grouped by
+    # superclass and in the order of their labels. Classes shown by an
+    # earlier call on the same model stay, and count against the budget.
+    if max_nodes is None and max_siblings is None:
+        return resultant_df, {}
+
+    siblings = {}
+    fixed = set()
+    for iri, superclass_iri, label in zip(resultant_df['IRI'],
+                                          resultant_df['Superclass IRI'],
+                                          resultant_df['Label']):
+        if superclass_iri in iris and iri not in iris and iri not in shown:
+            siblings.setdefault(superclass_iri, {}).setdefault(iri, label)
+        else:
+            fixed.add(iri)
+
+    def collapse(threshold):
+        kept = set(fixed)
+        for members in siblings.values():
+            kept.update(list(members)[:threshold])
+        clusters = {}
+        for superclass_iri, members in siblings.items():
+            members_ = [(iri, label) for iri, label in members.items()
+                        if iri not in kept]
+            if members_:
+                clusters.update({superclass_iri: members_})
+        return kept, clusters
+
+    # The largest number of siblings per superclass within the budget
+    threshold = max([len(members) for members in siblings.values()] + [0])
+    if max_siblings is not None:
+        threshold = min(threshold, max_siblings)
+    kept, clusters = collapse(threshold)
+    while max_nodes is not None and threshold > 0 and \
+            len(kept) + len(clusters) > max_nodes:
+        threshold -= 1
+        kept, clusters = collapse(threshold)
+
+    if not clusters:
+        return resultant_df, {}
+
+    resultant_df = resultant_df[resultant_df['IRI'].isin(kept)]
+
+    return resultant_df, clusters
+
+
+def __get_cluster_node_id__(superclass_iri):
+
+    # Spaces cannot occur in IRIs, which keeps the ids unambiguous
+    return f'{superclass_iri} subclasses'
+
+
+def __add_cluster_node__(model, superclass_iri, members):
+
+    node_id = __get_cluster_node_id__(superclass_iri=superclass_iri)
+
+    # Adding to a cluster left by an earlier call on the same model, without
+    # the classes shown by now
+    members_ = dict(model.nodes.get(node_id, {}).get('members', ()))
+    members_.update(members)
+    members_ = {iri: label for iri, label in members_.items()
+                if iri not in model}
+
+    if not members_:
+        if node_id in model:
+            model.remove_node(node_id)
+        return
+
+    tooltip = ''.join(f'• {label}\n'
+                      for label in list(members_.values())[:CLUSTER_MAX_LISTED])
+    if len(members_) > CLUSTER_MAX_LISTED:
+        tooltip += f'… {len(members_) - CLUSTER_MAX_LISTED} more\n'
+
+    model.add_node(node_id,
+                   label=f'Subclasses ({len(members_)})',
+                   tooltip=tooltip,
+                   color=CLUSTER_NODE_COLOR,
+                   shape=CLUSTER_NODE_SHAPE,
+                   size=NODE_SIZE,
+                   reset=False,
+                   cluster=superclass_iri,
+                   members=tuple(members_.items()))
+    model.add_edge(node_id,
+                   superclass_iri,
+                   key=SUBCLASS_OF,
+                   color=CLASS_EDGE_COLOR)
+
+
+def __add_datatypes_node__(model, iri, properties):
+
+    if not properties:
+        return
+
+    node_id = __get_datatype_node_id__(iri=iri, property_iri=DATATYPE_PROPERTY)
+    names = __get_names_from_iris__(
+        iris=[property_.get('property') for property_ in properties])
+
+    tooltip = ''.join(f'• {name}\n' for name in names[:CLUSTER_MAX_LISTED])
+    if len(names) > CLUSTER_MAX_LISTED:
+        tooltip += f'… {len(names) - CLUSTER_MAX_LISTED} more\n'
+
+    model.add_node(node_id,
+                   label=f'Datatype properties ({len(names)})',
+                   tooltip=tooltip,
+                   color=DATATYPE_NODE_COLOR,
+                   shape=DATATYPE_NODE_SHAPE,
+                   size=NODE_SIZE,
+                   reset=True)
+    model.add_edge(iri,
+                   node_id,
+                   key=DATATYPE_PROPERTY,
+                   color=PROPERTY_EDGE_COLOR)
+
+
+def __get_graph_model__(client,
+                        source_df,
+                        iris,
+                        show_superclasses=True,
+                        show_subclasses=True,
+                        show_properties=False,
+                        language='en',
+                        verbose_tooltips=False,
+                        merge_datatypes=False,
+                        max_nodes=None,
+                        max_siblings=None,
+                        aggregate_datatypes=False,
+                        model=None,
+                        class_properties=None):
+
+    # An existing model and the properties fetched for it are extended in
+    # place, so that only the rows around the given IRIs are processed
+    iris = list(set(iris))
+
+    __validate_args__(arg=iris, flat=False)
 
     def tooltip_properties(properties):
-        
+
         tooltip_ = ''
 
         for property_type in {'DatatypeProperty','ObjectProperty'}:
@@ -880,16 +3142,11 @@ def __get_network_graph__(tenant,
 
     def qualify_class(iri):
 
-        extracted_df = source_df[(source_df['Language'] == language) &
-                                 (source_df['Superclass language'].isin(
-                                     [language, '']))]
-        extracted_df = extracted_df.copy()[extracted_df['IRI'] == iri]
-        extracted_df.drop_duplicates(
-            subset=['IRI', 'Superclass IRI'], inplace=True)
-        if not extracted_df.empty:
-            name_or_label = extracted_df['Label'].values[0]
-            color = CLASS_COLOR if extracted_df['IsLeafClass'].values[0] \
-                else LEAFCLASS_COLOR
+        rows = index.get_rows(iri=iri, language=language, hierarchy=True)
+        if rows:
+            row = source_df.iloc[rows[0]]
+            name_or_label = row['Label']
+            color = CLASS_COLOR if row['IsLeafClass'] else LEAFCLASS_COLOR
         else:
             name_or_label = __get_name_from_iri__(iri)
             color = CLASS_COLOR
@@ -902,22 +3159,22 @@ def __get_network_graph__(tenant,
 
         return data
 
-    names = __get_names_from_iris__(iris=iris)
+    def set_node(node_id, node):
 
-    if show_properties:
-        if len(names) > 1:
-            title = 'Figure: Properties of classes '
-        else:
-            title = 'Figure: Properties of class '
-    else:
-        title = 'Figure: Class hierarchy of '
+        # Replacing all attributes, as a node may be qualified again
+        model.add_node(node_id)
+        attributes = model.nodes[node_id]
+        attributes.clear()
+        attributes.update(node)
 
-    title += ', '.join(names)
+    index = get_class_index(source_df=source_df)
 
-    # Creating a Network object
-    graph = Network(height=GRAPH_HEIGHT, width=GRAPH_WIDTH,
-                    directed=True, notebook=True, heading=title)
-    graph.repulsion(node_distance=NODE_DISTANCE, spring_length=SPRING_LENGTH)
+    # Edges are keyed by their predicate, so each one is held only once
+    if model is None:
+        model = nx.MultiDiGraph(title=__get_graph_title__(
+            iris=iris, show_properties=show_properties))
+    if class_properties is None:
+        class_properties = {}
 
     # Acquiring required DataFrame
     resultant_df = get_hierarchy(source_df=source_df,
@@ -927,34 +3184,71 @@ def __get_network_graph__(tenant,
                                  language=language,
                                  show_table=False)
 
-    # Acquiring descriptions for all classes
-    descriptions = __acquire_description__(
-        tenant=tenant, username=username, password=password)
+    # Collapsing surplus subclasses before anything is fetched for them
+    resultant_df, clusters = __collapse_siblings__(resultant_df=resultant_df,
+                                                   iris=iris,
+                                                   max_nodes=max_nodes,
+                                                   max_siblings=max_siblings,
+                                                   shown=model)
 
-    # Forming a dictionary out of involved classes and properties
-    nodes = {}
-    edges = []
+    # Acquiring descriptions for all classes
+    descriptions = __acquire_description__(client=client, source_df=source_df)
+
+    # Acquiring properties for all new classes in one batch, and for the
+    # ranges of their object properties in a second one if tooltips need them
+    class_iris = list(resultant_df['IRI'].unique())
+    if show_properties or verbose_tooltips:
+        class_properties.update(__acquire_properties__(
+            client=client,
+            iris=[iri for iri in class_iris if iri not in class_properties]))
+    if show_properties and verbose_tooltips:
+        ranges = {property_.get('property')
+                  for iri in class_iris
+                  for property_ in class_properties.get(iri, {}).get(
+                      'ObjectProperty', [])}
+        class_properties.update(__acquire_properties__(
+            client=client, iris=list(ranges - class_properties.keys())))
+
+    # Showing the datatype properties of a class as one node if there would
+    # be more nodes than the budget allows
+    if show_properties and max_nodes is not None and not aggregate_datatypes:
+        property_count = sum(
+            len(class_properties.get(iri, {}).get(property_type, []))
+            for iri in class_iris
+            for property_type in ['DatatypeProperty', 'ObjectProperty'])
+        aggregate_datatypes = \
+            len(class_iris) + len(clusters) + property_count > max_nodes
+
+    # Adding the involved classes and properties to the model
+    qualified = set()
     for _, row in resultant_df.iterrows():
         iri = row.get('IRI')
         superclass_iri = row.get('Superclass IRI')
         description = descriptions.get(iri, {}).get(language, None)
 
-        # Creating edges for properties
+        # Creating edges for superclasses
         if superclass_iri:
-            edge = {
-                'parent_node_id': superclass_iri,
-                'child_node_id': iri,
-                'color': CLASS_EDGE_COLOR
-            }
-            edges.append(edge)
+            model.add_edge(iri,
+                           superclass_iri,
+                           key=SUBCLASS_OF,
+                           color=CLASS_EDGE_COLOR)
         # Creating nodes for classes. The key 'reset' indicates that the data
         # for the IRI was populated by an object property, so we need to
         # qualify it.
-        if nodes.get(iri, {}).get('reset', True):
+        if model.nodes.get(iri, {}).get('reset', True):
+            all_properties = class_properties.get(iri, {})
+
+            # Adding properties to tooltip
+            tooltip_properties_ = tooltip_properties(all_properties) \
+                if verbose_tooltips else ''
+
             node = {
-                'node_id': iri,
                 'label': row.get('Label'),
-                'tooltip': tooltip_description(description),
+                'tooltip': __tooltips__.get(iri=iri,
+                                            language=language,
+                                            text=description,
+                                            verbose=verbose_tooltips,
+                                            properties=tooltip_properties_),
                 'color': CLASS_COLOR if row.get('IsLeafClass', False)
                 else LEAFCLASS_COLOR,
                 'shape': CLASS_SHAPE,
@@ -966,96 +3260,534 @@ def __get_network_graph__(tenant,
             if iri in iris:
                 node.update({'width': FOCUS_BORDER_WIDTH})
 
-            all_properties = __acquire_properties__(iri=iri,
-                                                    tenant=tenant,
-                                                    username=username,
-                                                    password=password)
-            # Adding properties to tooltip
-            if verbose_tooltips:
-                node.update({'tooltip': node.get('tooltip') +
-                            tooltip_properties(all_properties)})
-
-            nodes.update({iri: node})
-
-            # Adding nodes for properties
-            if show_properties:
-                properties = all_properties.get('DatatypeProperty', [])
-
-                properties += all_properties.get('ObjectProperty', [])
-
-                for property_ in properties:
-                    range_ = property_.get('property')
-                    if range_ not in nodes:
-                        name = __get_name_from_iri__(range_)
-                        node = {
-                            'node_id': range_,
-                            'label': name,
-                            'size': NODE_SIZE,
-                            'reset': True
-                        }
-
-                        # Configuring datatype and object properties differently
-                        if property_.get('type') == 'objectproperty':
-                            description = descriptions.get(
-                                range_, {}).get(language, None)
-
-                            node.update(**qualify_class(iri=range_))
-                            node.update(
-                                {'tooltip': tooltip_description(description)})
-
-                            if verbose_tooltips:
-                                all_properties = __acquire_properties__(
-                                    iri=range_,
-                                    tenant=tenant,
-                                    username=username,
-                                    password=password
-                                )
-                                node.update({'tooltip': node.get(
-                                    'tooltip')+'\n'+tooltip_properties(
-                                    all_properties)})
-                        else:
-                            range_ = node.get('node_id')+str(uuid.uuid4())
-                            node.update({'node_id': range_})
-                            node.update({'color': DATATYPE_NODE_COLOR})
-                            node.update({'shape': DATATYPE_NODE_SHAPE})
-
-                        nodes.update({range_: node})
-
-                    # Adding edges for properties
-                    name = __get_name_from_iri__(property_.get('property')),
-                    edge = {
-                        'parent_node_id': range_,
-                        'child_node_id': iri,
+            set_node(node_id=iri, node=node)
+
+        # Adding nodes for properties, once per class and call, so that an
+        # existing class gains them when it is expanded again
+        if show_properties and iri not in qualified:
+            qualified.add(iri)
+            all_properties = class_properties.get(iri, {})
+            properties = all_properties.get('DatatypeProperty', []) + \
+                all_properties.get('ObjectProperty', [])
+
+            if aggregate_datatypes:
+                properties = all_properties.get('ObjectProperty', [])
+                __add_datatypes_node__(
+                    model=model,
+                    iri=iri,
+                    properties=all_properties.get('DatatypeProperty', []))
+
+            for property_ in properties:
+                range_ = property_.get('property')
+
+                # Datatype nodes belong to their class, unless merged
+                if property_.get('type') != 'objectproperty' and \
+                        not merge_datatypes:
+                    range_ = __get_datatype_node_id__(
+                        iri=iri, property_iri=range_)
+
+                if not model.nodes.get(range_):
+                    name = __get_name_from_iri__(property_.get('property'))
+                    node = {
                         'label': name,
-                        'color': PROPERTY_EDGE_COLOR
+                        'size': NODE_SIZE,
+                        'reset': True
                     }
-                    edges.append(edge)
-
-    # Add nodes to the graph
-    for _, value in nodes.items():
-        graph.add_node(n_id=value.get('node_id'),
-                         color=value.get('color'),
-                         label=value.get('label'),
-                         shape=value.get('shape'),
-                         size=value.get('size'),
-                         title=value.get('tooltip', ''),
-                         borderWidth=value.get('width', 1),
-                         borderWidthSelected=value.get('width', 1)+1)
-
-    # Add edges to the graph
-    for edge in edges:
-        to = edge.get('parent_node_id')
-        source = edge.get('child_node_id')
-        if to in nodes.keys() and source in nodes.keys():
-            graph.add_edge(to=to,
-                             source=source,
-                             label=edge.get('label', ' '),
-                             color=edge.get('color'),
-                             arrowStrikethrough=True)
+
+                    # Configuring datatype and object properties differently
+                    if property_.get('type') == 'objectproperty':
+                        description = descriptions.get(
+                            range_, {}).get(language, None)
+
+                        node.update(**qualify_class(iri=range_))
+
+                        tooltip_properties_ = '\n' + tooltip_properties(
+                            class_properties.get(range_, {})) \
+                            if verbose_tooltips else ''
+                        node.update({'tooltip': __tooltips__.get(
+                            iri=range_,
+                            language=language,
+                            text=description,
+                            verbose=verbose_tooltips,
+                            properties=tooltip_properties_)})
+                    else:
+                        node.update({'color': DATATYPE_NODE_COLOR})
+                        node.update({'shape': DATATYPE_NODE_SHAPE})
+
+                    set_node(node_id=range_, node=node)
+
+                # Adding edges for properties
+                model.add_edge(iri,
+                               range_,
+                               key=property_.get('property'),
+                               label=__get_name_from_iri__(
+                                   property_.get('property')),
+                               color=PROPERTY_EDGE_COLOR)
+
+    for superclass_iri, members in clusters.items():
+        __add_cluster_node__(
+            model=model, superclass_iri=superclass_iri, members=members)
+
+    # Dropping the superclasses which were not qualified, with their edges
+    model.remove_nodes_from(
+        [node_id for node_id, node in model.nodes(data=True) if not node])
+
+    # Dropping the classes shown by now from the clusters of earlier calls
+    for node_id, node in list(model.nodes(data=True)):
+        if node.get('members'):
+            __add_cluster_node__(model=model,
+                                 superclass_iri=node.get('cluster'),
+                                 members=())
+
+    return model
+
+
+def __get_tree_layout__(model):
+
+    # Superclasses are parents of their subclasses, classes of their
+    # properties. Every node is placed below its first parent, leaves side by
+    # side and parents centred above their children.
+    children = {}
+    has_parent = set()
+    for source, target, key in model.edges(keys=True):
+        parent, child = (target, source) if key == SUBCLASS_OF \
+            else (source, target)
+        children.setdefault(parent, []).append(child)
+        has_parent.add(child)
+
+    def get_children(node):
+        return iter(sorted(children.get(node, []),
+                           key=lambda child: str(model.nodes[child].get(
+                               'label', child))))
+
+    roots = [node for node in model.nodes if node not in has_parent]
+
+    positions = {}
+    visited = set()
+    slot = 0
+    # Nodes left over are on cycles, and become roots themselves
+    for root in roots + list(model.nodes):
+        if root in visited:
+            continue
+        visited.add(root)
+
+        stack = [(root, 0, get_children(root), [])]
+        while stack:
+            node, depth, iterator, slots = stack[-1]
+            child = next(iterator, None)
+            if child is None:
+                stack.pop()
+                if slots:
+                    x = sum(slots) / len(slots)
+                else:
+                    x = float(slot)
+                    slot += 1
+                y = float(depth * LAYOUT_LEVEL_SEPARATION)
+                positions.update({node: (x * LAYOUT_NODE_SPACING, y)})
+                if stack:
+                    stack[-1][3].append(x)
+            elif child not in visited:
+                visited.add(child)
+                stack.append((child, depth + 1, get_children(child), []))
+
+    return positions
+
+
+def __validate_layout__(layout):
+
+    if layout is not None and layout not in LAYOUTS:
+        raise ValueError(f'Layout {layout} is not supported, use one of ' +
+                         ', '.join(LAYOUTS) + '.')
+
+    return True
+
+
+def __set_layout__(model, layout):
+
+    __validate_layout__(layout=layout)
+
+    # Storing the positions on the nodes, for the Network and the exporters
+    if layout == 'hierarchical':
+        positions = __get_tree_layout__(model=model)
+    elif layout == 'radial':
+        # Bending the tree around its centre, the slots becoming angles and
+        # the levels radii. The roots are on the first ring, as there may be
+        # many of them.
+        positions = __get_tree_layout__(model=model)
+        width = max([x for x, _ in positions.values()], default=0) + \
+            LAYOUT_NODE_SPACING
+        positions = {
+            node: ((y + LAYOUT_LEVEL_SEPARATION) * math.cos(
+                       2 * math.pi * x / width),
+                   (y + LAYOUT_LEVEL_SEPARATION) * math.sin(
+                       2 * math.pi * x / width))
+            for node, (x, y) in positions.items()}
+    else:
+        function = getattr(nx, f'{layout}_layout')
+        positions = function(model) if layout != 'spring' \
+            else function(model, seed=LAYOUT_SEED)
+        positions = {node: (float(x) * LAYOUT_SCALE, float(y) * LAYOUT_SCALE)
+                     for node, (x, y) in positions.items()}
+
+    for node_id, (x, y) in positions.items():
+        model.nodes[node_id].update({'x': x, 'y': y})
+
+    return model
+
+
+def __get_network__(model, layout=None):
+
+    if layout:
+        model = __set_layout__(model=model, layout=layout)
+
+    # Creating a Network object
+    graph = Network(height=GRAPH_HEIGHT,
+                    width=GRAPH_WIDTH,
+                    directed=True,
+                    notebook=True,
+                    heading=model.graph.get('title', ''))
+    if layout:
+        graph.toggle_physics(False)
+    else:
+        graph.repulsion(node_distance=NODE_DISTANCE,
+                        spring_length=SPRING_LENGTH)
+
+    # Add nodes to the graph. The nodes of the model are unique, so they are
+    # appended without add_node looking each one up in the list of nodes,
+    # which takes quadratic time for thousands of nodes.
+    for node_id, node in model.nodes(data=True):
+        position = {'x': node.get('x'), 'y': node.get('y'),
+                    'physics': False} if layout else {}
+        options = Node(node_id,
+                       node.get('shape'),
+                       label=node.get('label') or node_id,
+                       color=node.get('color'),
+                       font_color=graph.font_color,
+                       size=node.get('size'),
+                       title=node.get('tooltip', ''),
+                       borderWidth=node.get('width', 1),
+                       borderWidthSelected=node.get('width', 1)+1,
+                       **position).options
+        graph.nodes.append(options)
+        graph.node_ids.append(node_id)
+        graph.node_map[node_id] = options
+
+    # Add edges to the graph, likewise without add_edge looking up both
+    # nodes
+    for source, to, edge in model.edges(data=True):
+        graph.edges.append(Edge(source,
+                                to,
+                                graph.directed,
+                                label=edge.get('label', ' '),
+                                color=edge.get('color'),
+                                arrowStrikethrough=True).options)
 
     return graph
 
 
+def __get_network_graph__(client,
+                          source_df,
+                          iris,
+                          show_superclasses=True,
+                          show_subclasses=True,
+                          show_properties=False,
+                          language='en',
+                          verbose_tooltips=False,
+                          merge_datatypes=False,
+                          max_nodes=None,
+                          max_siblings=None,
+                          aggregate_datatypes=False,
+                          layout=None):
+
+    # Checked before any request is sent
+    __validate_layout__(layout=layout)
+
+    model = __get_graph_model__(client=client,
+                                source_df=source_df,
+                                iris=iris,
+                                show_superclasses=show_superclasses,
+                                show_subclasses=show_subclasses,
+                                show_properties=show_properties,
+                                language=language,
+                                verbose_tooltips=verbose_tooltips,
+                                merge_datatypes=merge_datatypes,
+                                max_nodes=max_nodes,
+                                max_siblings=max_siblings,
+                                aggregate_datatypes=aggregate_datatypes)
+
+    return __get_network__(model=model, layout=layout)
+
+
+class GraphSession:
+
+    """A graph which grows by expanding classes, instead of being rebuilt.
+
+    It keeps the nodes and edges shown so far along with the properties
+    fetched for them. Expanding a class only processes the rows around it and
+    fetches the properties of classes not seen before, so a drill-down costs
+    time in proportion to what it adds.
+
+    Args:
+        client (OntologyClient): The client to acquire properties with.
+        source_df (DataFrame): Primary DataFrame to query from.
+        language (str, optional): Language to query for. Could accept either
+        of these: 'en', 'de', and 'fr'. Defaults to 'en'.
+        verbose_tooltips (bool, optional): Flag to display extended tooltip.
+        Defaults to False.
+        merge_datatypes (bool, optional): Flag to show a datatype property
+        shared by several classes as one node. Defaults to False.
+        max_nodes (int, optional): Budget of class nodes added per expansion.
+        Surplus subclasses are collapsed into one node, which expand_cluster
+        expands. Defaults to None.
+        max_siblings (int, optional): Subclasses shown per expanded class
+        before the rest are collapsed into one node. Defaults to None.
+        aggregate_datatypes (bool, optional): Flag to show the datatype
+        properties of a class as one node. Defaults to False.
+        layout (str, optional): Layout computed before rendering, with physics
+        disabled, see get_hierarchy_graph. Defaults to None.
+    """
+
+    def __init__(self,
+                 client,
+                 source_df,
+                 language='en',
+                 verbose_tooltips=False,
+                 merge_datatypes=False,
+                 max_nodes=None,
+                 max_siblings=None,
+                 aggregate_datatypes=False,
+                 layout=None):
+
+        __validate_layout__(layout=layout)
+
+        self.client = client
+        self.source_df = source_df
+        self.language = language
+        self.verbose_tooltips = verbose_tooltips
+        self.merge_datatypes = merge_datatypes
+        self.max_nodes = max_nodes
+        self.max_siblings = max_siblings
+        self.aggregate_datatypes = aggregate_datatypes
+        self.layout = layout
+
+        self.iris = []
+        self.show_properties = False
+        self.model = nx.MultiDiGraph(title='')
+        self.class_properties = {}
+
+    def expand(self, iri, superclasses=True, subclasses=True, properties=False):
+
+        """It adds the superclasses, subclasses and properties of a class.
+
+        Args:
+            iri (string): The IRI of the class to expand.
+            superclasses (bool, optional): Flag to add the superclasses.
+            Defaults to True.
+            subclasses (bool, optional): Flag to add the subclasses.
+            Defaults to True.
+            properties (bool, optional): Flag to add the properties of the
+            class and of the added classes. Defaults to False.
+
+        Returns:
+            Network: The Network object loaded with all nodes and edges of
+            the session.
+        """
+
+        __validate_args__(arg=iri, flat=True)
+
+        __get_graph_model__(client=self.client,
+                            source_df=self.source_df,
+                            iris=[iri],
+                            show_superclasses=superclasses,
+                            show_subclasses=subclasses,
+                            show_properties=properties,
+                            language=self.language,
+                            verbose_tooltips=self.verbose_tooltips,
+                            merge_datatypes=self.merge_datatypes,
+                            max_nodes=self.max_nodes,
+                            max_siblings=self.max_siblings,
+                            aggregate_datatypes=self.aggregate_datatypes,
+                            model=self.model,
+                            class_properties=self.class_properties)
+
+        # The class may have been shown before, but is a focus node now
+        if iri in self.model:
+            self.model.nodes[iri].update({'width': FOCUS_BORDER_WIDTH})
+
+        if iri not in self.iris:
+            self.iris.append(iri)
+        self.show_properties = self.show_properties or properties
+        self.model.graph.update({'title': __get_graph_title__(
+            iris=self.iris, show_properties=self.show_properties)})
+
+        return self.get_network()
+
+    def expand_cluster(self, node_id):
+
+        """It replaces a node of collapsed subclasses by the subclasses.
+
+        Args:
+            node_id (string): The id of the node, whose tooltip lists the
+            collapsed subclasses.
+
+        Returns:
+            Network: The Network object loaded with all nodes and edges of
+            the session.
+        """
+
+        members = self.model.nodes.get(node_id, {}).get('members')
+
+        if not members:
+            return self.get_network()
+
+        self.model.remove_node(node_id)
+        iris = [iri for iri, _ in members]
+
+        __get_graph_model__(client=self.client,
+                            source_df=self.source_df,
+                            iris=iris,
+                            show_superclasses=False,
+                            show_subclasses=False,
+                            show_properties=self.show_properties,
+                            language=self.language,
+                            verbose_tooltips=self.verbose_tooltips,
+                            merge_datatypes=self.merge_datatypes,
+                            aggregate_datatypes=self.aggregate_datatypes,
+                            model=self.model,
+                            class_properties=self.class_properties)
+
+        # The subclasses are shown, but are no focus nodes
+        for iri in iris:
+            if iri in self.model and iri not in self.iris:
+                self.model.nodes[iri].pop('width', None)
+
+        return self.get_network()
+
+    def get_network(self):
+
+        """It generates a Network object of the session.
+
+        Returns:
+            Network: The Network object loaded with all nodes and edges of
+            the session.
+        """
+
+        return __get_network__(model=self.model, layout=self.layout)
+
+
+def get_graph_session(tenant,
+                      username,
+                      password,
+                      source_df,
+                      language='en',
+                      verbose_tooltips=False,
+                      merge_datatypes=False,
+                      max_nodes=None,
+                      max_siblings=None,
+                      aggregate_datatypes=False,
+                      layout=None):
+
+    """It starts an empty graph which grows by expanding classes.
+
+    Args:
+        tenant (string): Tenant id to access API.
+        username (string): Username to access API.
+        password (string): Password to access API.
+        source_df (DataFrame): Primary DataFrame to query from.
+        language (str, optional): Language to query for. Could accept either
+        of these: 'en', 'de', and 'fr'.
+        Defaults to 'en'.
+        verbose_tooltips (bool, optional): Flag to display extended tooltip.
+        Defaults to False.
+        merge_datatypes (bool, optional): Flag to show a datatype property
+        shared by several classes as one node. Defaults to False.
+        max_nodes (int, optional): Budget of class nodes added per expansion.
+        Defaults to None.
+        max_siblings (int, optional): Subclasses shown per expanded class
+        before the rest are collapsed into one node. Defaults to None.
+        aggregate_datatypes (bool, optional): Flag to show the datatype
+        properties of a class as one node. Defaults to False.
+        layout (str, optional): Layout computed before rendering, with physics
+        disabled, see get_hierarchy_graph. Defaults to None.
+
+    Returns:
+        GraphSession: The session, see GraphSession.expand.
+    """
+
+    client = __get_client__(tenant=tenant, username=username, password=password)
+
+    return client.get_graph_session(source_df=source_df,
+                                    language=language,
+                                    verbose_tooltips=verbose_tooltips,
+                                    merge_datatypes=merge_datatypes,
+                                    max_nodes=max_nodes,
+                                    max_siblings=max_siblings,
+                                    aggregate_datatypes=aggregate_datatypes,
+                                    layout=layout)
+
+
+def __get_ontology_model__(source_df, language):
+
+    index = get_class_index(source_df=source_df)
+    class_rows = index.class_rows.get(language, {})
+
+    # Tooltips come from the annotations loaded with the model, if any, so
+    # that no requests are made. They are not memoized, as thousands of them
+    # would only push the tooltips of the other graphs out of the cache.
+    store = get_annotation_store(source_df=source_df)
+    descriptions = store.get_kind('description') if store is not None else {}
+
+    rows = list(class_rows.values())
+    labels = source_df['Label'].iloc[rows].tolist()
+    leaves = source_df['IsLeafClass'].iloc[rows].tolist()
+
+    model = nx.MultiDiGraph(title=ONTOLOGY_GRAPH_TITLE)
+    model.add_nodes_from(
+        (iri, {'label': label,
+               'tooltip': __tooltips__.layout(
+                   descriptions.get(iri, {}).get(language, None)),
+               'color': CLASS_COLOR if leaf else LEAFCLASS_COLOR,
+               'shape': CLASS_SHAPE,
+               'size': ONTOLOGY_NODE_SIZE})
+        for iri, label, leaf in zip(class_rows, labels, leaves))
+    model.add_edges_from(
+        (iri, superclass_iri, SUBCLASS_OF, {'color': CLASS_EDGE_COLOR})
+        for iri in class_rows
+        for superclass_iri in index.superclasses.get(iri, {})
+        if superclass_iri in class_rows)
+
+    return model
+
+
+def get_ontology_graph(source_df, language='en', layout='radial'):
+
+    """It generates a Network object of the class hierarchy of the whole
+    ontology.
+
+    The graph is built from the given DataFrame alone, without requests, and
+    is laid out before rendering, so that it holds thousands of classes.
+    Export it in the 'graphology' format to draw it with a WebGL renderer
+    such as sigma.js.
+
+    Args:
+        source_df (DataFrame): Primary DataFrame to query from.
+        language (str, optional): Language to query for. Could accept either
+        of these: 'en', 'de', and 'fr'. Defaults to 'en'.
+        layout (str, optional): Layout computed before rendering, with physics
+        disabled, see get_hierarchy_graph. Physics lays out the graph if
+        None, which is slow for thousands of classes. Defaults to 'radial'.
+
+    Returns:
+        Network: The Network object loaded with nodes and edges to display.
+    """
+
+    __validate_layout__(layout=layout)
+
+    model = __get_ontology_model__(source_df=source_df, language=language)
+
+    return __get_network__(model=model, layout=layout)
+
+
 def get_individual_properties_graph(tenant, username, password, iri):
     """It generates a Network object of the class properties for the given
     list of IRIs.
@@ -1088,54 +3820,164 @@ def get_individual_properties_graph(tenant, username, password, iri):
 
 def create_character_graph(tenant, username, password, iri):
 
-    __validate_args__(arg=iri, flat=True)
-    net = Network(height=GRAPH_HEIGHT, width=GRAPH_WIDTH,
-                    directed=True,notebook=True)
+    client = __get_client__(tenant=tenant, username=username, password=password)
 
-    net.repulsion(node_distance=NODE_DISTANCE, spring_length=SPRING_LENGTH)
+    return client.create_character_graph(iri=iri)
 
-    url = f'{BASE_URL}{TEMPLATE_NAMESPACE}/v1/execute-template'
 
-    access_token = __get_access_token__(
-        tenant=tenant, username=username, password=password)
+def __get_graph_data__(graph):
 
-    headers = {
-        'Content-Type': 'application/json',
-        'x-enapso-auth': access_token
+    nodes, edges, heading, height, width, options = graph.get_network_data()
+
+    data = {
+        'heading': heading,
+        'height': height,
+        'width': width,
+        'nodes': nodes,
+        'edges': edges,
+        'options': json.loads(options)
+    }
+
+    return data
+
+
+def __get_graphology_data__(graph):
+
+    # The serialization format of graphology, which sigma.js draws with
+    # WebGL. Only what such renderers draw is kept, so the file stays small
+    # for thousands of nodes.
+    def get_attributes(item, keys):
+        return {key: item[key] for key in keys
+                if item.get(key) not in (None, '', ' ')}
+
+    data = {
+        'attributes': {'name': graph.heading},
+        'options': {'type': 'directed', 'multi': True, 'allowSelfLoops': True},
+        'nodes': [{'key': node['id'],
+                   'attributes': get_attributes(
+                       node, ('label', 'x', 'y', 'size', 'color'))}
+                  for node in graph.nodes],
+        'edges': [{'source': edge['from'],
+                   'target': edge['to'],
+                   'attributes': get_attributes(edge, ('label', 'color'))}
+                  for edge in graph.edges]
     }
 
+    return data
+
+
+def __get_graphml__(graph):
+
+    # GraphML only holds scalar attributes, so nested vis.js options are left
+    # out
+    def get_attributes(item, skipped):
+        return {key: value for key, value in item.items()
+                if key not in skipped and value is not None
+                and isinstance(value, (str, int, float, bool))}
+
+    model = nx.MultiDiGraph(title=graph.heading)
+    for node in graph.nodes:
+        model.add_node(node['id'], **get_attributes(node, {'id'}))
+    for edge in graph.edges:
+        model.add_edge(edge['from'],
+                       edge['to'],
+                       **get_attributes(edge, {'from', 'to'}))
+
+    return '\n'.join(nx.generate_graphml(model))
+
+
+def __get_graph_page__(graph):
+
+    # Escaping closing tags, so the JSON cannot end the script element early
+    data = json.dumps(__get_graph_data__(graph=graph),
+                      separators=(',', ':'),
+                      ensure_ascii=False).replace('</', '<\\/')
+
+    return GRAPH_PAGE.format(title=html.escape(graph.heading),
+                             vis_style=VIS_STYLE_URL,
+                             vis_script=VIS_SCRIPT_URL,
+                             assets=GRAPH_ASSETS_DIR,
+                             data=data)
+
+
+def __write_graph_file__(path, content):
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # Writing next to the target first, so readers never see a partial file
+    temporary_path = f'{path}.{uuid.uuid4()}.tmp'
     try:
-        body = {
-            "template":  "http://ont.telekom.de/cia/sparql-template#SPARQLTemplate_2c08776d-ee35-4ac5-9d22-b4835d394e56",
-            'variables': {"individualIRI": iri}
-        }
-        response = requests.post(
-            url=url, headers=headers, json=body, timeout=REQUEST_TIMEOUT)
-        response.raise_for_status()
-    except requests.exceptions.RequestException as exception:
-        return False, str(exception)
+        with open(temporary_path, 'wb') as file:
+            file.write(content)
+        os.replace(temporary_path, path)
+    finally:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
 
-    individuals = response.json()
-    individuals = individuals.get('records')
+    return path
 
-    if not individuals:
-        return net
-    
-    main_node_value = __get_name_from_iri__(individuals[0]['className'])
 
-    if main_node_value is None:
-        return net
+def __write_graph_assets__(directory):
 
-    net.add_node(main_node_value, title=iri , color="#fcfcfc" , size=50 )
+    # The pages of a directory share one copy of the script and style
+    for name, content in [('graph.js', GRAPH_SCRIPT),
+                          ('graph.css', GRAPH_STYLE)]:
+        path = os.path.join(directory, GRAPH_ASSETS_DIR, name)
+        if not os.path.exists(path):
+            __write_graph_file__(path=path, content=content.encode('utf-8'))
 
 
-    for obj in individuals:
-        nodeTitle=f"{str(obj['propertyValue'])}\n({__get_name_from_iri__(obj['property'])})"
-        if obj['propertyType'] == "http://www.w3.org/2002/07/owl#DatatypeProperty":
-            net.add_node( nodeTitle, color=DATATYPE_NODE_COLOR, title="Data Property"  , size=40 )
-        else:
-            net.add_node(nodeTitle, color="#ABEBC6", title="Object Property", size= 40)
-        net.add_edge(main_node_value, nodeTitle)
+def export_graph(graph,
+                 name,
+                 file_format='json',
+                 compress=False,
+                 directory=GRAPHS_DIR):
+
+    """It writes a Network object to a file, more compact than the page
+    written by Network.show.
+
+    Args:
+        graph (Network): The Network object, as returned by the graph
+        functions.
+        name (string): Name of the file, without extension.
+        file_format (str, optional): Format to write. Could accept either of
+        these: 'json' for the nodes, edges and options as vis.js DataSet
+        items, 'graphml', 'html' for a page which loads the script and style
+        shared by the pages of the directory, and 'graphology' for the nodes
+        and edges as read by sigma.js, which needs a laid out graph.
+        Defaults to 'json'.
+        compress (bool, optional): Flag to gzip the file. Defaults to False.
+        directory (str, optional): Directory to write the file to.
+        Defaults to the graphs directory.
+
+    Returns:
+        string: The path of the written file.
+    """
+
+    if file_format not in GRAPH_EXPORT_FORMATS:
+        raise ValueError(f'Format {file_format} is not supported.')
+
+    if file_format == 'json':
+        content = json.dumps(__get_graph_data__(graph=graph),
+                             separators=(',', ':'),
+                             ensure_ascii=False)
+    elif file_format == 'graphology':
+        content = json.dumps(__get_graphology_data__(graph=graph),
+                             separators=(',', ':'),
+                             ensure_ascii=False)
+    elif file_format == 'graphml':
+        content = __get_graphml__(graph=graph)
+    else:
+        __write_graph_assets__(directory=directory)
+        content = __get_graph_page__(graph=graph)
+
+    content = content.encode('utf-8')
+    path = os.path.join(directory,
+                        f'{name}.{GRAPH_EXPORT_FORMATS.get(file_format)}')
 
+    # A fixed mtime keeps the files of the same graph identical
+    if compress:
+        content = gzip.compress(content, mtime=0)
+        path += '.gz'
 
-    return net
\ No newline at end of file
+    return __write_graph_file__(path=path, content=content)
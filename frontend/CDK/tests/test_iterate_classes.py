@@ -0,0 +1,124 @@
+import json
+import random
+
+import pytest
+
+from scripts import ontologies
+
+
+class Response:
+
+    # Serving the body in chunks of random sizes, like a streamed response
+
+    def __init__(self, body, seed=0):
+
+        self.body = body
+        self.random = random.Random(seed)
+
+    def iter_content(self, chunk_size):
+
+        position = 0
+        while position < len(self.body):
+            size = self.random.randint(1, chunk_size)
+            yield self.body[position:position + size]
+            position += size
+
+    def close(self):
+
+        pass
+
+
+def __get_string__(rnd):
+
+    if rnd.random() < 0.1:
+        return 'x' * rnd.randrange(50, 300) + rnd.choice(['', '"', 'é'])
+
+    return ''.join(rnd.choice('ab{}[]",\\ é€\n:')
+                   for _ in range(rnd.randrange(6)))
+
+
+def __get_element__(rnd, depth=0, width=4):
+
+    members = [('cls', 'ex:' + __get_string__(rnd)),
+               ('label', __get_string__(rnd)),
+               ('lang', rnd.choice(['en', 'de', ''])),
+               ('leaf', rnd.random() < 0.4)]
+    members = [member for member in members if rnd.random() < 0.9]
+    for i in range(rnd.randrange(3)):
+        members.append((f'x{i}' + __get_string__(rnd),
+                        rnd.choice([__get_string__(rnd), 3, 1.5, None, True,
+                                    [1, {'x': '['}], {'k': ['}']}])))
+    rnd.shuffle(members)
+
+    # The backend sends the children last
+    if depth < 4 and rnd.random() < 0.7:
+        members.append(('children',
+                        [__get_element__(rnd, depth + 1, width)
+                         for _ in range(rnd.randrange(width))]))
+
+    return dict(members)
+
+
+def __get_body__(records, rnd):
+
+    document = {'pre': [1, {'a': 'b'}], 'records': records, 'post': 1}
+
+    return json.dumps(document,
+                      ensure_ascii=rnd.random() < 0.5,
+                      indent=rnd.choice([None, 0, 1])).encode()
+
+
+def __get_expected__(body):
+
+    return list(ontologies.__flatten__(json.loads(body)['records']))
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 16, 64 * 1024])
+@pytest.mark.parametrize('window_size', [1, 8, 64, 4 * 1024])
+def test_rows_match_decoded_tree(monkeypatch, chunk_size, window_size):
+
+    monkeypatch.setattr(ontologies, 'STREAM_CHUNK_SIZE', chunk_size)
+    monkeypatch.setattr(ontologies, 'STREAM_WINDOW_SIZE', window_size)
+
+    rnd = random.Random(chunk_size * 31 + window_size)
+    for seed in range(50):
+        records = [__get_element__(rnd) for _ in range(rnd.randrange(4))]
+        body = __get_body__(records, rnd)
+
+        rows = list(ontologies.__iterate_classes__(Response(body, seed)))
+
+        assert rows == __get_expected__(body)
+
+
+@pytest.mark.parametrize('window_size', [64, 4 * 1024])
+def test_large_subtrees_match_decoded_tree(monkeypatch, window_size):
+
+    monkeypatch.setattr(ontologies, 'STREAM_CHUNK_SIZE', 256)
+    monkeypatch.setattr(ontologies, 'STREAM_WINDOW_SIZE', window_size)
+
+    # Subtrees far larger than the window are read class by class
+    rnd = random.Random(window_size)
+    records = []
+    while sum(len(json.dumps(record)) > 4 * window_size
+              for record in records) < 3:
+        records.append(__get_element__(rnd, width=8))
+    body = __get_body__(records, rnd)
+
+    rows = list(ontologies.__iterate_classes__(Response(body)))
+
+    assert rows == __get_expected__(body)
+
+
+@pytest.mark.parametrize('window_size', [8, 4 * 1024])
+def test_truncated_body_raises(monkeypatch, window_size):
+
+    monkeypatch.setattr(ontologies, 'STREAM_CHUNK_SIZE', 16)
+    monkeypatch.setattr(ontologies, 'STREAM_WINDOW_SIZE', window_size)
+
+    rnd = random.Random(window_size)
+    records = [__get_element__(rnd) for _ in range(3)]
+    body = json.dumps({'records': records}).encode()
+
+    for cut in range(len('{"records": ['), len(body) - 1, 7):
+        with pytest.raises(json.JSONDecodeError):
+            list(ontologies.__iterate_classes__(Response(body[:cut])))